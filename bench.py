@@ -0,0 +1,405 @@
+import sys
+import math
+import time
+import random
+import argparse
+
+import numpy as np
+import pygame
+from spacewar.spatial import SpatialHashGrid, segment_rect_entry
+from spacewar import ecs
+from spacewar.ecs import match_once
+from spacewar.enemystore import EnemyStore, EnemyView
+from spacewar import assets
+
+# Benchmarks for the collision/query code. The world grows with the entity count
+# so density stays at what a 1300x750 screen holds with 300 enemies on it; brute
+# force then scales quadratically and the grid linearly.
+SIZES = [100, 300, 1000, 3000, 10000]
+DENSITY = 1300 * 750 / 300   # screen area per enemy when 300 are on screen
+
+def world_size(n):
+    side = int((n * DENSITY) ** 0.5)
+    return side, side
+
+def timeit(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+def report(title, rows, headers):
+    print(title)
+    print("".join(f"{h:>12}" for h in headers))
+    for row in rows:
+        print("".join(f"{v:>12.3f}" if isinstance(v, float) else f"{v:>12}" for v in row))
+    print()
+
+# ---------------- BULLETS VS ENEMIES ----------------
+class Box:
+    def __init__(self, x, y, size):
+        self.rect = pygame.Rect(x, y, size, size)
+
+def make_boxes(rng, n, size, w, h):
+    return [Box(rng.randrange(w), rng.randrange(h), size) for _ in range(n)]
+
+def bullets_brute(bullets, enemies):
+    hits = 0
+    for b in bullets:
+        for en in enemies:
+            if b.rect.colliderect(en.rect):
+                hits += 1
+                break
+    return hits
+
+def bullets_grid(bullets, enemies, grid):
+    grid.rebuild(enemies)
+    hits = 0
+    for b in bullets:
+        for en in grid.query(b.rect):
+            if b.rect.colliderect(en.rect):
+                hits += 1
+                break
+    return hits
+
+def bench_bullets(sizes):
+    rows = []
+    for n in sizes:
+        rng = random.Random(n)
+        w, h = world_size(n)
+        enemies = make_boxes(rng, n, 30, w, h)
+        bullets = make_boxes(rng, max(1, n // 4), 10, w, h)
+        grid = SpatialHashGrid(64)
+        assert bullets_brute(bullets, enemies) == bullets_grid(bullets, enemies, grid)
+        brute = timeit(lambda: bullets_brute(bullets, enemies), 1 if n > 3000 else 3)
+        fast = timeit(lambda: bullets_grid(bullets, enemies, grid))
+        rows.append((n, len(bullets), brute, fast, brute / fast))
+    report("bullets vs enemies, ms per tick (grid time includes the rebuild)", rows,
+           ["enemies", "bullets", "brute", "grid", "speedup"])
+
+# ---------------- NEAREST TARGET ----------------
+def nearest_brute(points, enemies, k):
+    out = []
+    for x, y in points:
+        out.append(sorted(enemies, key=lambda en: (en.rect.centerx - x) ** 2 + (en.rect.centery - y) ** 2)[:k])
+    return out
+
+def nearest_grid(points, grid, k):
+    return [grid.nearest(x, y, k) for x, y in points]
+
+def bench_nearest(sizes, k=3, shots=50):
+    rows = []
+    for n in sizes:
+        rng = random.Random(n)
+        w, h = world_size(n)
+        enemies = make_boxes(rng, n, 30, w, h)
+        points = [(rng.randrange(w), rng.randrange(h)) for _ in range(shots)]
+        grid = SpatialHashGrid(64)
+        grid.rebuild(enemies)
+        brute = timeit(lambda: nearest_brute(points, enemies, k), 1 if n > 3000 else 3)
+        fast = timeit(lambda: nearest_grid(points, grid, k))
+        rows.append((n, shots, brute, fast, brute / fast))
+    report(f"{k}-nearest enemies for {shots} shots, ms", rows, ["enemies", "shots", "brute", "grid", "speedup"])
+
+# ---------------- LASER BEAM ----------------
+def beam_brute(rays, enemies, pierce):
+    out = []
+    for ray in rays:
+        hits = []
+        for en in enemies:
+            t = segment_rect_entry(*ray, en.rect)
+            if t is not None:
+                hits.append((t, en))
+        hits.sort(key=lambda h: h[0])
+        out.append(hits[:pierce])
+    return out
+
+def beam_grid(rays, grid, pierce):
+    return [grid.raycast(*ray, pierce) for ray in rays]
+
+def bench_beam(sizes, length=700, pierce=5, casts=50):
+    rows = []
+    for n in sizes:
+        rng = random.Random(n)
+        w, h = world_size(n)
+        enemies = make_boxes(rng, n, 30, w, h)
+        rays = []
+        for _ in range(casts):
+            x, y, a = rng.randrange(w), rng.randrange(h), rng.uniform(0, 2 * math.pi)
+            rays.append((x, y, x + length * math.cos(a), y + length * math.sin(a)))
+        grid = SpatialHashGrid(64)
+        grid.rebuild(enemies)
+        assert [[t for t, _ in r] for r in beam_brute(rays, enemies, pierce)] == \
+               [[t for t, _ in r] for r in beam_grid(rays, grid, pierce)]
+        brute = timeit(lambda: beam_brute(rays, enemies, pierce), 1 if n > 3000 else 3)
+        fast = timeit(lambda: beam_grid(rays, grid, pierce))
+        rows.append((n, casts, brute, fast, brute / fast))
+    report(f"{length} px beam, pierce {pierce}, {casts} casts, ms", rows, ["enemies", "casts", "brute", "grid", "speedup"])
+
+# ---------------- CIRCLE SWEEP AND PRUNE ----------------
+class SweepAndPrune:
+    """Sort-and-sweep broadphase for circle entities stored as dicts with "x"/"y"
+    (and optionally "r") keys: what py5.py and py 6.py used before the ECS
+    replaced it with ecs.overlaps(), kept here as the baseline it is measured
+    against.
+
+    Entries stay sorted by their left edge from one frame to the next. Things
+    only move a few pixels per frame, so the insertion sort that restores the
+    order touches very few entries and the whole pass stays close to O(n).
+    """
+    def __init__(self):
+        self.entries = []   # [left, ent, group, r], sorted by left
+        self.index = {}     # id(ent) -> entry; entries keep ents alive so ids are never reused
+
+    def __len__(self):
+        return len(self.index)
+
+    def sync(self, group, ents, radius=0):
+        """Make `group` hold exactly `ents`. New ones get ent["r"] or `radius`."""
+        live = {id(e): e for e in ents}
+        for key, entry in list(self.index.items()):
+            if entry[2] == group and key not in live:
+                entry[1] = None
+                del self.index[key]
+        for key, e in live.items():
+            if key not in self.index:
+                r = e.get("r", radius)
+                entry = [e["x"] - r, e, group, r]
+                self.entries.append(entry)
+                self.index[key] = entry
+
+    def _refresh(self):
+        entries = [entry for entry in self.entries if entry[1] is not None]
+        for entry in entries:
+            entry[0] = entry[1]["x"] - entry[3]
+        # Insertion sort: cheap on a list that was sorted last frame
+        for i in range(1, len(entries)):
+            entry = entries[i]
+            left = entry[0]
+            j = i - 1
+            while j >= 0 and entries[j][0] > left:
+                entries[j + 1] = entries[j]
+                j -= 1
+            entries[j + 1] = entry
+        self.entries = entries
+
+    def pairs(self, group_a, group_b):
+        """(a, b) for every a in group_a and b in group_b whose circles overlap."""
+        self._refresh()
+        active = []   # entries whose x extent may still reach the sweep line
+        out = []
+        for entry in self.entries:
+            left, e, group, r = entry
+            if group != group_a and group != group_b:
+                continue
+            active = [other for other in active if other[0] + 2 * other[3] >= left]
+            x, y = e["x"], e["y"]
+            for other in active:
+                if other[2] == group:
+                    continue
+                o = other[1]
+                reach = r + other[3]
+                dy = o["y"] - y
+                if -reach < dy < reach and (o["x"] - x) ** 2 + dy * dy < reach * reach:
+                    out.append((e, o) if group == group_a else (o, e))
+            active.append(entry)
+        return out
+
+def circles_brute(bullets, enemies):
+    return [(b, e) for b in bullets for e in enemies
+            if math.hypot(b["x"] - e["x"], b["y"] - e["y"]) < e["r"] + 5]
+
+def circles_sap(sap, bullets, enemies):
+    sap.sync("bullet", bullets, 5)
+    sap.sync("enemy", enemies)
+    return sap.pairs("bullet", "enemy")
+
+def bench_circles(sizes, frames=5):
+    rows = []
+    for n in sizes:
+        rng = random.Random(n)
+        w, h = world_size(n)
+        enemies = [{"x": rng.uniform(0, w), "y": rng.uniform(0, h), "r": 25} for _ in range(n)]
+        bullets = [{"x": rng.uniform(0, w), "y": rng.uniform(0, h)} for _ in range(max(1, n // 4))]
+        sap = SweepAndPrune()
+        circles_sap(sap, bullets, enemies)   # first frame sorts from scratch
+
+        def jiggle():
+            for e in enemies:
+                e["x"] += rng.uniform(-2, 2)
+        def run_sap():
+            for _ in range(frames):
+                jiggle(); circles_sap(sap, bullets, enemies)
+        def run_brute():
+            for _ in range(frames):
+                jiggle(); circles_brute(bullets, enemies)
+        brute = timeit(run_brute, 1) / frames
+        fast = timeit(run_sap, 1) / frames
+        rows.append((n, len(bullets), brute, fast, brute / fast))
+    report("circle bullets vs enemies (dict entities), ms per frame", rows,
+           ["enemies", "bullets", "brute", "sweep", "speedup"])
+
+# ---------------- ENEMY CHASE ----------------
+class Walker:
+    def __init__(self, x, y, size, speed):
+        self.x, self.y, self.w, self.h, self.speed = x, y, size, size, speed
+
+def chase_objects(enemies, tx, ty):
+    for en in enemies:
+        dx, dy = tx - (en.x + en.w / 2), ty - (en.y + en.h / 2)
+        dist = math.hypot(dx, dy)
+        if dist > 0:
+            en.x += dx / dist * en.speed
+            en.y += dy / dist * en.speed
+
+def bench_chase(sizes, frames=10):
+    rows = []
+    for n in sizes:
+        rng = random.Random(n)
+        w, h = world_size(n)
+        spots = [(rng.uniform(0, w), rng.uniform(0, h), rng.uniform(2, 4)) for _ in range(n)]
+        walkers = [Walker(x, y, 30, s) for x, y, s in spots]
+        store = EnemyStore()
+        for x, y, s in spots:
+            store.add(EnemyView(), x, y, 30, 30, s, 1, 1)
+        tx, ty = w / 2, h / 2
+        brute = timeit(lambda: [chase_objects(walkers, tx, ty) for _ in range(frames)]) / frames
+        fast = timeit(lambda: [store.chase(tx, ty) for _ in range(frames)]) / frames
+        rows.append((n, brute, fast, brute / fast))
+    report("enemies chasing the player, ms per frame", rows, ["enemies", "objects", "arrays", "speedup"])
+
+# ---------------- CROWD SEPARATION ----------------
+def separate_brute(c, r):
+    """All-pairs version of EnemyStore.separate()'s neighbor search."""
+    d = c[:, None, :] - c[None, :, :]
+    dist = np.hypot(d[..., 0], d[..., 1])
+    near = np.triu(dist < r[:, None] + r[None, :], 1)
+    return int(near.sum())
+
+def bench_separation(sizes, frames=5):
+    rows = []
+    for n in [3, 10, 30] + sizes:   # small crowds too: most of a run has only a few enemies up
+        rng = np.random.default_rng(n)
+        w, h = world_size(n)
+        store = EnemyStore()
+        for x, y in zip(rng.uniform(0, w, n), rng.uniform(0, h, n)):
+            store.add(EnemyView(), x, y, 30, 30, 2, 1, 1)
+        c = np.stack([store.x[:n] + 15, store.y[:n] + 15], axis=1)
+        r = np.full(n, 15 * 0.8)
+        reps = frames * max(1, 100 // n)
+        x0, y0 = store.x.copy(), store.y.copy()
+        def run():
+            store.x[:], store.y[:] = x0, y0   # same crowd each time, not one already spread out
+            return timeit(lambda: [store.separate() for _ in range(reps)], 1) / reps
+        brute = timeit(lambda: separate_brute(c, r), 1) if n <= 3000 else float("nan")
+        fast = run()
+        store.SEPARATE_DENSE = 0   # always through the grid join
+        grid = run()
+        rows.append((n, brute, grid, fast, fast * 1000 / n))
+    report("crowd separation, ms per frame (brute: all-pairs neighbor search only)", rows,
+           ["enemies", "brute", "grid only", "separate", "us/enemy"])
+
+# ---------------- SIMULATION LOD ----------------
+def make_store(rng, n, w, h):
+    store = EnemyStore()
+    for x, y in zip(rng.uniform(0, w, n), rng.uniform(0, h, n)):
+        store.add(EnemyView(), x, y, 30, 30, 2, 1, 1)
+    return store
+
+def tick_full(store, grid, tx, ty):
+    store.chase(tx, ty)
+    store.separate()
+    grid.rebuild(store)
+
+def tick_lod(store, grid, view, tx, ty):
+    store.steer(tx, ty, np.arange(store.n))
+    rows, steps = store.lod(view, tx, ty)
+    store.advance(1.0, rows, steps)
+    store.separate(rows=rows)
+    store.refile(grid)
+
+def bench_lod(sizes, frames=8):
+    rows = []
+    for n in sizes:
+        rng = np.random.default_rng(n)
+        w, h = world_size(n)
+        view = pygame.Rect(0, 0, 1300, 750)
+        view.center = (w // 2, h // 2)
+        full, lod = make_store(rng, n, w, h), make_store(np.random.default_rng(n), n, w, h)
+        grid_full, grid_lod = SpatialHashGrid(64), SpatialHashGrid(64)
+        tick_lod(lod, grid_lod, view, w / 2, h / 2)   # first refile files everyone
+        brute = timeit(lambda: [tick_full(full, grid_full, w / 2, h / 2) for _ in range(frames)], 1) / frames
+        fast = timeit(lambda: [tick_lod(lod, grid_lod, view, w / 2, h / 2) for _ in range(frames)], 1) / frames
+        rows.append((n, brute, fast, brute / fast))
+    report("enemy update with a 1300x750 view (chase, separation, grid), ms per frame", rows,
+           ["enemies", "every tick", "lod", "speedup"])
+
+# ---------------- ROTATED SPRITES ----------------
+def bench_rotation(sizes):
+    sprite = pygame.Surface((40, 40), pygame.SRCALPHA)
+    pygame.draw.polygon(sprite, (255, 255, 0), [(0, 15), (40, 20), (0, 25)])
+    rows = []
+    for n in sizes:
+        rng = random.Random(n)
+        angles = [rng.uniform(0, 360) for _ in range(n)]
+        direct = timeit(lambda: [pygame.transform.rotate(sprite, a) for a in angles], 1)
+        cached = timeit(lambda: [assets.rotated(sprite, a) for a in angles], 1)
+        rows.append((n, direct, cached, direct / cached))
+    report("sprites rotated to random angles, ms", rows, ["sprites", "rotate", "cache", "speedup"])
+
+# ---------------- ECS FRAME ----------------
+def frame_dicts(sap, bullets, enemies, tx, ty):
+    for e in enemies:
+        dx, dy = tx - e["x"], ty - e["y"]
+        dist = math.hypot(dx, dy)
+        if dist:
+            e["x"] += dx / dist * e["speed"]
+            e["y"] += dy / dist * e["speed"]
+    for b in bullets:
+        b["x"] += b["vx"]; b["y"] += b["vy"]
+    sap.sync("bullet", bullets, 5)
+    sap.sync("enemy", enemies)
+    return len(match_once(sap.pairs("bullet", "enemy"), key=id))
+
+def frame_world(world, tx, ty):
+    ecs.chase(world, tx, ty)
+    ecs.move(world)
+    return len(ecs.match_once(ecs.overlaps(world, 1, 2)))
+
+def bench_ecs(sizes, frames=5):
+    rows = []
+    for n in sizes:
+        rng = random.Random(n)
+        w, h = world_size(n)
+        enemies = [{"x": rng.uniform(0, w), "y": rng.uniform(0, h), "r": 25, "speed": 2} for _ in range(n)]
+        bullets = [{"x": rng.uniform(0, w), "y": rng.uniform(0, h), "vx": rng.uniform(-10, 10), "vy": rng.uniform(-10, 10)}
+                   for _ in range(max(1, n // 4))]
+        world = ecs.World()
+        for e in enemies:
+            world.create(2, pos=(e["x"], e["y"]), vel=(0, 0), radius=e["r"], speed=e["speed"])
+        for b in bullets:
+            world.create(1, pos=(b["x"], b["y"]), vel=(b["vx"], b["vy"]), radius=5)
+        sap = SweepAndPrune()
+        frame_dicts(sap, bullets, enemies, w / 2, h / 2)   # first frame sorts from scratch
+        brute = timeit(lambda: [frame_dicts(sap, bullets, enemies, w / 2, h / 2) for _ in range(frames)], 1) / frames
+        fast = timeit(lambda: [frame_world(world, w / 2, h / 2) for _ in range(frames)], 1) / frames
+        rows.append((n, len(bullets), brute, fast, brute / fast))
+    report("chase + move + bullet hits, ms per frame", rows, ["enemies", "bullets", "dicts", "ecs", "speedup"])
+
+BENCHES = {"bullets": bench_bullets, "nearest": bench_nearest, "beam": bench_beam, "circles": bench_circles,
+           "chase": bench_chase, "separation": bench_separation, "lod": bench_lod,
+           "rotation": bench_rotation, "ecs": bench_ecs}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Collision and query benchmarks.")
+    parser.add_argument("bench", nargs="*", help=f"which benchmarks to run: {', '.join(BENCHES)} (default: all)")
+    parser.add_argument("--max", type=int, default=SIZES[-1], help="largest entity count to try")
+    args = parser.parse_args()
+    for name in args.bench:
+        if name not in BENCHES: parser.error(f"unknown benchmark {name!r}")
+    sizes = [n for n in SIZES if n <= args.max]
+    for name in args.bench or BENCHES:
+        BENCHES[name](sizes)
+    sys.exit()
@@ -0,0 +1,78 @@
+import os
+import sys
+import time
+import random
+import argparse
+
+# Must be set before pygame creates a window
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from spacewar import engine
+from spacewar.pool import pool_report
+
+MOVE_KEYS = [pygame.K_w, pygame.K_a, pygame.K_s, pygame.K_d]
+
+# ---------------- BOT ----------------
+class RandomBot:
+    """Wanders in a random direction, changing every so often, and taps SPACE
+    (held for that update too, so variants that fire while it is held shoot)."""
+    def __init__(self, rng, turn_every=30, fire_every=10):
+        self.rng = rng
+        self.turn_every = turn_every
+        self.fire_every = fire_every
+        self.tick = 0
+        self.held = set()
+
+    def __call__(self):
+        if self.tick % self.turn_every == 0:
+            self.held = set(self.rng.sample(MOVE_KEYS, self.rng.randint(0, 2)))
+        fire = [pygame.K_SPACE] if self.tick % self.fire_every == 0 else []
+        self.tick += 1
+        return engine.Inputs(engine.KeySet(self.held | set(fire)), engine.KeySet(fire), upgrade=self.rng.randrange(4))
+
+# ---------------- SIMULATION ----------------
+def simulate(minutes, dt=1000/60, seed=0, bot=None):
+    """Run the game for `minutes` of simulated time with no display and no frame cap.
+    A new run is started whenever the player dies. Returns a dict of stats."""
+    random.seed(seed)
+    bot = bot or RandomBot(random.Random(seed))
+    steps = round(minutes * 60_000 / dt)
+    engine.game_clock.max_steps = None  # never drop simulated time
+    runs, deaths, max_level = 1, 0, 1
+    engine.start_game()
+    for _ in range(steps):
+        engine.step(bot(), dt)
+        max_level = max(max_level, engine.player.level)
+        if engine.game_state == engine.GAME_OVER:
+            deaths += 1
+            runs += 1
+            engine.start_game()
+    return {"steps": steps, "runs": runs, "deaths": deaths, "max_level": max_level,
+            "enemies": len(engine.enemies), "gems": len(engine.gems)}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the game without a window, as fast as possible.")
+    parser.add_argument("--minutes", type=float, default=10, help="simulated minutes of play")
+    parser.add_argument("--dt", type=float, default=1000/60, help="milliseconds per step")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--variant", default="main", help="name from spacewar/variants/ or a variant JSON file")
+    parser.add_argument("--mem-report", action="store_true", help="print a memory report, with growth per simulated hour")
+    parser.add_argument("--mem-budget", type=float, help="allowed growth in MiB per hour of play")
+    args = parser.parse_args()
+
+    engine.setup(args.variant)
+    engine.mem_watch.budget = args.mem_budget
+    if args.mem_report: engine.mem_watch.start()
+    t0 = time.perf_counter()
+    stats = simulate(args.minutes, args.dt, args.seed)
+    wall = time.perf_counter() - t0
+    print(", ".join(f"{k}={v}" for k, v in stats.items()))
+    print(f"simulated {args.minutes:g} min in {wall:.2f} s ({args.minutes * 60 / wall:.0f}x real time)")
+    print("\n".join(pool_report()))
+    print("ai      " + ", ".join(f"{k} {v}" for k, v in engine.ai.stats().items()))
+    print("spawns  " + ", ".join(f"{k} {v}" for k, v in engine.director.stats().items()))
+    print("timers  " + ", ".join(f"{k} {v}" for k, v in engine.timers.stats().items()))
+    if args.mem_report: print("\n".join(engine.memory_report()))
+    pygame.quit(); sys.exit()
@@ -2,6 +2,8 @@ import pygame
 import math
 import random
 import sys
+from spacewar import ecs
+from spacewar.navigation import FlowField
 from pathlib import Path
 
 # ----------------- Configuration -----------------
@@ -14,6 +16,7 @@ PLAYER_SPEED = 4
 BULLET_SPEED = 10
 ENEMY_SPEED = 1.8
 ENEMY_COUNT = 5
+ENEMY_SHADES = [(150 + 20 * i, 20 + 10 * (i % 3), 20 + 10 * (i % 4)) for i in range(5)]   # reds to pick from
 # --------------------------------------------------
 
 pygame.init()
@@ -112,6 +115,14 @@ level_map = [
     [2,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,2],
     [2,2,2,2,2,2,2,2,2,2,2,2,2,2,2,2,2,2,2,2,2,2,2,2,2],
 ]
+# Enemies can't cross water; everything off the map is open floor
+SOLID_TILES = {0}
+nav_grid = [[True] * ((SCREEN_W + TILE_SIZE - 1) // TILE_SIZE) for _ in range((SCREEN_H + TILE_SIZE - 1) // TILE_SIZE)]
+for r, row in enumerate(level_map):
+    for c, t in enumerate(row):
+        nav_grid[r][c] = t not in SOLID_TILES
+nav = FlowField(nav_grid, TILE_SIZE)
+
 # Map tile graphics (use safe get_tile)
 tile_graphics = {
     0: get_tile(0, 5),    # water (safe fallback if out of bounds)
@@ -127,8 +138,9 @@ frame_index = 0
 frame_delay = 10
 frame_counter = 0
 
-bullets = []  # each bullet: dict x,y,vx,vy
-enemies = []
+# Bullets and enemies are entities in one ECS world
+BULLET, ENEMY = 1, 2
+world = ecs.World()
 
 def spawn_enemy():
     # spawn away from player
@@ -138,11 +150,12 @@ def spawn_enemy():
         if math.hypot(x - player_x, y - player_y) > 120:
             break
     radius = random.randint(12, 20)
-    color = (150 + random.randint(0,80), 20 + random.randint(0,40), 20 + random.randint(0,40))
-    return {"x": x, "y": y, "r": radius, "col": color}
+    color = random.choice(ENEMY_SHADES)  # a fixed palette keeps world.sprites to a few entries
+    return world.create(ENEMY, pos=(x, y), vel=(0, 0), radius=radius, sprite=world.sprite_id((color, radius)),
+                        speed=ENEMY_SPEED)
 
 for _ in range(ENEMY_COUNT):
-    enemies.append(spawn_enemy())
+    spawn_enemy()
 
 # Helper drawing functions
 def draw_map():
@@ -163,15 +176,15 @@ def draw_player():
     screen.blit(surf, (px, py))
 
 def draw_bullets():
-    for b in bullets:
-        pygame.draw.circle(screen, (30, 144, 255), (int(b["x"]), int(b["y"])), 4)
+    ecs.draw(world, screen, BULLET)
 
 def draw_enemies():
-    for e in enemies:
-        pygame.draw.circle(screen, e["col"], (int(e["x"]), int(e["y"])), e["r"])
+    ecs.draw(world, screen, ENEMY)
+    rows = world.select(ecs.POSITION, ENEMY)
+    for (x, y), r in zip(world.pos[rows].tolist(), world.radius[rows].tolist()):
         # small health bar (visual only)
-        pygame.draw.rect(screen, (0,0,0), (e["x"]-e["r"], e["y"]-e["r"]-8, e["r"]*2, 4))
-        pygame.draw.rect(screen, (0,200,0), (e["x"]-e["r"]+1, e["y"]-e["r"]-7, int((e["r"]*2-2)), 3))
+        pygame.draw.rect(screen, (0,0,0), (x-r, y-r-8, r*2, 4))
+        pygame.draw.rect(screen, (0,200,0), (x-r+1, y-r-7, int((r*2-2)), 3))
 
 # Main loop
 running = True
@@ -195,7 +208,8 @@ while running:
                     vx, vy = 0, -BULLET_SPEED
                 else:  # down
                     vx, vy = 0, BULLET_SPEED
-                bullets.append({"x": bx, "y": by, "vx": vx, "vy": vy})
+                world.create(BULLET, pos=(bx, by), vel=(vx, vy), sprite=world.sprite_id(((30, 144, 255), 4)),
+                             bounded=True)
 
     keys = pygame.key.get_pressed()
     moving = False
@@ -230,49 +244,30 @@ while running:
         frame_index = 0
         frame_counter = 0
 
-    # update bullets
-    for b in bullets[:]:
-        b["x"] += b["vx"]
-        b["y"] += b["vy"]
-        # remove off-screen bullets
-        if b["x"] < -10 or b["x"] > SCREEN_W + 10 or b["y"] < -10 or b["y"] > SCREEN_H + 10:
-            bullets.remove(b)
-
-    # update enemies (chase player)
-    for e in enemies:
-        dx = player_x - e["x"]
-        dy = player_y - e["y"]
-        dist = math.hypot(dx, dy)
-        if dist != 0:
-            e["x"] += dx / dist * ENEMY_SPEED
-            e["y"] += dy / dist * ENEMY_SPEED
-
-    # bullet-enemy collisions
-    for b in bullets[:]:
-        for e in enemies[:]:
-            if math.hypot(b["x"] - e["x"], b["y"] - e["y"]) < e["r"]:
-                # hit: remove enemy and bullet, spawn new enemy after short delay (instant spawn here)
-                try:
-                    bullets.remove(b)
-                except ValueError:
-                    pass
-                try:
-                    enemies.remove(e)
-                except ValueError:
-                    pass
-                enemies.append(spawn_enemy())
-                break
+    # update bullets and enemies; drop off-screen bullets. Enemies follow the flow
+    # field around the water, and head straight at the player on the player's tile
+    nav.set_goal(player_x, player_y)
+    ecs.chase(world, player_x, player_y)
+    ecs.follow(world, nav)
+    ecs.move(world)
+    ecs.cull(world, screen.get_rect(), 10)
+
+    # bullet-enemy collisions (bullets are points, enemies use their own radius)
+    hits = ecs.match_once(ecs.overlaps(world, BULLET, ENEMY))
+    if hits:
+        # hit: remove enemy and bullet, spawn new enemy after short delay (instant spawn here)
+        world.destroy_rows([row for pair in hits for row in pair])
+        for _ in hits:
+            spawn_enemy()
 
     # enemy-player collision (simple game over)
-    for e in enemies:
-        if math.hypot(player_x - e["x"], player_y - e["y"]) < e["r"] + 8:
-            # simple visual feedback then exit
-            text = font.render("You were caught! Game over — press ESC to quit.", True, (255, 255, 255))
-            screen.blit(text, (20, SCREEN_H - 30))
-            pygame.display.flip()
-            pygame.time.delay(1200)
-            running = False
-            break
+    if len(ecs.touching(world, ENEMY, player_x, player_y, 8)):
+        # simple visual feedback then exit
+        text = font.render("You were caught! Game over — press ESC to quit.", True, (255, 255, 255))
+        screen.blit(text, (20, SCREEN_H - 30))
+        pygame.display.flip()
+        pygame.time.delay(1200)
+        running = False
 
     # draw
     screen.fill((100, 120, 140))
@@ -282,7 +277,7 @@ while running:
     draw_player()
 
     # HUD
-    hud = font.render(f"Enemies: {len(enemies)} | FramesPerRow: {frames_per_row} | Rows: {rows} | SpriteSize: {sprite_w}x{sprite_h}", True, (255,255,255))
+    hud = font.render(f"Enemies: {world.count(ENEMY)} | FramesPerRow: {frames_per_row} | Rows: {rows} | SpriteSize: {sprite_w}x{sprite_h}", True, (255,255,255))
     screen.blit(hud, (8, SCREEN_H - 22))
 
     pygame.display.flip()
@@ -1,6 +1,7 @@
 import pygame
 import random
-import math
+import numpy as np
+from spacewar import ecs
 
 # Initialize Pygame
 pygame.init()
@@ -39,22 +40,28 @@ except pygame.error:
     player_image = pygame.Surface((player_width, player_height))
     player_image.fill((0, 0, 255))
 
+# Bullets and enemies are entities in one ECS world
+BULLET, ENEMY = 1, 2
+world = ecs.World()
+
 # Bullets
 bullet_size = 10
 bullet_speed = 10
-bullets = []
 last_shot_time = 0
 bullet_cooldown = 200  # milliseconds
 
 # Enemy
 enemy_radius = 25
 enemy_speed = 2
-enemies = []
+
+
+def shoot(x, y, vx, vy):
+    return world.create(BULLET, pos=(x, y), vel=(vx, vy), radius=5, sprite=world.sprite_id((WHITE, 5)), bounded=True)
 
 
 # Function to spawn a new enemy from a random side (top, left, or right)
 def spawn_enemy():
-    """Generates a new enemy dictionary with a random spawn location."""
+    """Creates a new enemy entity at a random spawn location."""
     spawn_side = random.choice(["top", "left", "right"])
 
     if spawn_side == "top":
@@ -67,17 +74,13 @@ def spawn_enemy():
         x = WIDTH + enemy_radius  # Spawn just off-screen
         y = random.randint(enemy_radius, HEIGHT - enemy_radius)
 
-    return {
-        "x": x,
-        "y": y,
-        "color": random.choice(RED_SHADES),
-        "speed": enemy_speed
-    }
+    sprite = world.sprite_id((random.choice(RED_SHADES), enemy_radius))
+    return world.create(ENEMY, pos=(x, y), vel=(0, 0), radius=enemy_radius, sprite=sprite, speed=enemy_speed)
 
 
 # Spawn initial enemies
 for _ in range(5):
-    enemies.append(spawn_enemy())
+    spawn_enemy()
 
 # Health
 player_health = 100
@@ -118,56 +121,39 @@ while running:
     bullet_spawn_y = player_y + player_height // 2
 
     if keys[pygame.K_w] and current_time - last_shot_time > bullet_cooldown:
-        bullets.append({"x": bullet_spawn_x, "y": bullet_spawn_y, "vx": 0, "vy": -bullet_speed})
+        shoot(bullet_spawn_x, bullet_spawn_y, 0, -bullet_speed)
         last_shot_time = current_time
     elif keys[pygame.K_s] and current_time - last_shot_time > bullet_cooldown:
-        bullets.append({"x": bullet_spawn_x, "y": bullet_spawn_y, "vx": 0, "vy": bullet_speed})
+        shoot(bullet_spawn_x, bullet_spawn_y, 0, bullet_speed)
         last_shot_time = current_time
     elif keys[pygame.K_a] and current_time - last_shot_time > bullet_cooldown:
-        bullets.append({"x": bullet_spawn_x, "y": bullet_spawn_y, "vx": -bullet_speed, "vy": 0})
+        shoot(bullet_spawn_x, bullet_spawn_y, -bullet_speed, 0)
         last_shot_time = current_time
     elif keys[pygame.K_d] and current_time - last_shot_time > bullet_cooldown:
-        bullets.append({"x": bullet_spawn_x, "y": bullet_spawn_y, "vx": bullet_speed, "vy": 0})
+        shoot(bullet_spawn_x, bullet_spawn_y, bullet_speed, 0)
         last_shot_time = current_time
 
-    # Move bullets based on their velocity vectors
-    for bullet in bullets[:]:
-        bullet["x"] += bullet["vx"]
-        bullet["y"] += bullet["vy"]
-        # Remove bullets that go off-screen
-        if bullet["x"] < 0 or bullet["x"] > WIDTH or bullet["y"] < 0 or bullet["y"] > HEIGHT:
-            bullets.remove(bullet)
-
-    # Draw bullets
-    for bullet in bullets:
-        pygame.draw.circle(screen, WHITE, (int(bullet["x"]), int(bullet["y"])), 5)
-
-    # Move and draw enemies
-    for enemy in enemies[:]:
-        # Enemy chases player
-        dx = (player_x + player_width / 2) - enemy["x"]
-        dy = (player_y + player_height / 2) - enemy["y"]
-        dist = math.hypot(dx, dy)
-        if dist != 0:
-            enemy["x"] += (dx / dist) * enemy["speed"]
-            enemy["y"] += (dy / dist) * enemy["speed"]
-
-        # Collision with player
-        player_rect = pygame.Rect(player_x, player_y, player_width, player_height)
-        enemy_rect = pygame.Rect(enemy["x"] - enemy_radius, enemy["y"] - enemy_radius, enemy_radius * 2,
-                                 enemy_radius * 2)
-        if player_rect.colliderect(enemy_rect):
-            player_health -= 1
-
-        # Collision with bullets
-        for bullet in bullets[:]:
-            bullet_dist = math.hypot(bullet["x"] - enemy["x"], bullet["y"] - enemy["y"])
-            if bullet_dist < enemy_radius + 5:  # 5 is bullet radius
-                bullets.remove(bullet)
-                enemies.remove(enemy)
-                enemies.append(spawn_enemy())
-
-        pygame.draw.circle(screen, enemy["color"], (int(enemy["x"]), int(enemy["y"])), enemy_radius)
+    # Systems: enemies steer at the player, everything moves, off-screen bullets go
+    ecs.chase(world, player_x + player_width / 2, player_y + player_height / 2)
+    ecs.move(world)
+    ecs.cull(world, screen.get_rect())
+
+    # Collision with player: each enemy whose bounding box overlaps the player's costs 1 health
+    ex, ey = world.pos[world.select(ecs.POSITION, ENEMY)].T
+    near_x = np.abs(ex - (player_x + player_width / 2)) < player_width / 2 + enemy_radius
+    near_y = np.abs(ey - (player_y + player_height / 2)) < player_height / 2 + enemy_radius
+    player_health -= int(np.count_nonzero(near_x & near_y))
+
+    # Collision with bullets: each bullet/enemy is used up by at most one hit
+    hits = ecs.match_once(ecs.overlaps(world, BULLET, ENEMY))
+    if hits:
+        world.destroy_rows([row for pair in hits for row in pair])
+        for _ in hits:
+            spawn_enemy()
+
+    # Draw bullets, then enemies
+    ecs.draw(world, screen, BULLET)
+    ecs.draw(world, screen, ENEMY)
 
     # Draw the player image
     screen.blit(player_image, (player_x, player_y))
@@ -0,0 +1,11 @@
+"""Space War: one engine (engine.py) shared by every game variant.
+
+Variants are JSON files in variants/ that change screen size, assets and
+gameplay settings. Launch one with
+
+    python -m spacewar --variant h2
+
+Importing the package (or the engine) does no pygame work; engine.setup()
+opens the window and loads the chosen variant's assets.
+"""
+from .variants import DEFAULTS, load_variant, variant_names
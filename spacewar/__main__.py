@@ -0,0 +1,32 @@
+import sys
+import argparse
+
+import pygame
+
+from . import engine
+from .variants import variant_names
+
+# ---------------- LAUNCHER ----------------
+def main(argv=None, variant="main"):
+    parser = argparse.ArgumentParser(prog="spacewar", description="Play a Space War variant.")
+    parser.add_argument("--variant", default=variant, help="name from variants/ or path to a variant JSON file")
+    parser.add_argument("--list", action="store_true", help="list the variants and exit")
+    parser.add_argument("--sim-hz", type=int, default=engine.SIM_HZ, help="simulation updates per second")
+    parser.add_argument("--fps", type=int, default=engine.DISPLAY_FPS, help="display frame cap")
+    parser.add_argument("--mem-report", action="store_true", help="trace allocations from launch and print a memory report on exit (F2 prints one any time)")
+    parser.add_argument("--mem-budget", type=float, help="allowed growth in MiB per hour of play, checked by the memory report")
+    args = parser.parse_args(argv)
+    if args.list:
+        print("\n".join(variant_names()))
+        return
+    engine.setup(args.variant)
+    engine.set_sim_rate(args.sim_hz); engine.DISPLAY_FPS = args.fps
+    engine.mem_watch.budget = args.mem_budget
+    if args.mem_report: engine.mem_watch.start()
+    engine.run()
+    if args.mem_report: print("\n".join(engine.memory_report()))
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
+    sys.exit()
@@ -0,0 +1,73 @@
+import time
+import numpy as np
+
+# ---------------- AI SCHEDULER ----------------
+class AIScheduler:
+    """Spreads expensive AI decisions over several updates.
+
+    Each kind of decision is a named channel that walks its agents round-robin,
+    so every agent decides once per `buckets` updates and the rest of the time
+    steers on what it decided last. Work per update therefore stays at about
+    1/buckets of the agents however many there are.
+
+    Two ways to use it:
+      rows(name, n)              row indices (of n) due this update, for decisions
+                                 made as one array operation over a store
+      run(name, agents, think)   calls think(agent) for the agents due, and stops
+                                 early once this update's `budget_ms` is spent;
+                                 the agents skipped are first in line next time
+
+    Call tick() at the start of every update to reset the budget.
+    """
+    def __init__(self, buckets=4, budget_ms=None, timer=time.perf_counter):
+        self.buckets = buckets
+        self.budget_ms = budget_ms    # None for no time limit
+        self.timer = timer
+        self.spent = 0.0              # ms used by run() this update
+        self._cursor = {}             # channel -> next agent position
+        self._credit = {}             # channel -> decisions owed, carried across updates
+        self.decisions = 0
+        self.over_budget = 0          # run() calls cut short by the budget
+
+    def tick(self):
+        self.spent = 0.0
+
+    def _due(self, name, n):
+        """(start, count): the next `count` agents of n from the channel's cursor."""
+        if n == 0:
+            self._credit[name] = 0.0
+            return 0, 0
+        credit = min(self._credit.get(name, 0.0) + n / self.buckets, n)
+        count = int(credit)
+        self._credit[name] = credit - count
+        start = self._cursor.get(name, 0) % n
+        return start, count
+
+    def rows(self, name, n):
+        start, count = self._due(name, n)
+        self._cursor[name] = start + count
+        self.decisions += count
+        return (start + np.arange(count)) % n if count else np.arange(0)
+
+    def run(self, name, agents, think):
+        """Run think(agent) for this update's share of agents. Returns how many ran."""
+        agents = list(agents)
+        n = len(agents)
+        start, count = self._due(name, n)
+        t0 = self.timer()
+        ran = 0
+        while ran < count:
+            think(agents[(start + ran) % n])
+            ran += 1
+            if self.budget_ms is not None and self.spent + (self.timer() - t0) * 1000 >= self.budget_ms:
+                break
+        self.spent += (self.timer() - t0) * 1000
+        if ran < count:
+            self._credit[name] += count - ran
+            self.over_budget += 1
+        self._cursor[name] = start + ran
+        self.decisions += ran
+        return ran
+
+    def stats(self):
+        return {"decisions": self.decisions, "over_budget": self.over_budget}
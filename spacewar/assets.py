@@ -0,0 +1,76 @@
+import os
+import functools
+import pygame
+from .masks import ROTATION_STEPS, rotation_step
+
+# ---------------- ASSETS ----------------
+# Images and fonts are loaded on first use and cached, so only what the running
+# variant asks for is ever read from disk, and variants that share a file at
+# the same size share the surface (and its cached masks).
+ASSET_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))   # images live at the repo root
+
+@functools.lru_cache(maxsize=None)
+def _load(file, size, color):
+    path = os.path.join(ASSET_DIR, file) if file else None
+    if path and os.path.exists(path):
+        surf = pygame.image.load(path)
+        surf = surf.convert_alpha() if surf.get_alpha() is not None or surf.get_colorkey() else surf.convert()
+        return pygame.transform.scale(surf, size)
+    if color is None:
+        return None
+    # Per-pixel alpha, so a rotated copy is padded with transparent corners
+    # rather than the fill colour (which would also grow its mask)
+    surf = pygame.Surface(size, pygame.SRCALPHA)
+    surf.fill(color)
+    return surf
+
+def image(spec, default_size):
+    """Surface for an asset spec ({"file", "size", "color"}), scaled to its size
+    or to default_size. Needs the display mode set (for convert())."""
+    size = tuple(spec.get("size") or default_size)
+    color = spec.get("color")
+    return _load(spec.get("file"), size, tuple(color) if color else None)
+
+@functools.lru_cache(maxsize=None)
+def tinted(surface, color, scale=1.0):
+    """Copy of surface scaled by `scale` and multiplied by color, e.g. for
+    upgraded tiers of a pickup."""
+    w, h = surface.get_size()
+    surf = pygame.transform.smoothscale(surface.convert_alpha(), (round(w * scale), round(h * scale)))
+    surf.fill(color, special_flags=pygame.BLEND_RGB_MULT)
+    return surf
+
+# Rotated sprites are shared the same way. Rotations snap to one of
+# ROTATION_STEPS, and each surface/step pair is rotated once. One cache entry
+# holds the rotated sprite and its collision mask, so the two always match.
+ROTATED_MAX = 1024   # rotated sprites kept; the least recently used go first
+
+def rotated(surface, angle, steps=ROTATION_STEPS):
+    """surface rotated by angle degrees, snapped to one of `steps` rotations."""
+    if surface is None:
+        return None
+    return _rotated(surface, rotation_step(angle, steps), steps)[0]
+
+def rotated_mask(surface, angle, steps=ROTATION_STEPS):
+    """Collision mask of rotated(surface, angle, steps)."""
+    if surface is None:
+        return None
+    return _rotated(surface, rotation_step(angle, steps), steps)[1]
+
+@functools.lru_cache(maxsize=ROTATED_MAX)
+def _rotated(surface, step, steps):
+    image = pygame.transform.rotate(surface, step * 360 / steps)
+    return image, pygame.mask.from_surface(image)
+
+def warm_rotations(surface, steps=ROTATION_STEPS):
+    """Rotate surface to every step up front, e.g. at load for something that
+    spins or is fired in every direction, so play never pays for a rotation."""
+    if surface is not None:
+        for step in range(steps):
+            _rotated(surface, step, steps)
+
+@functools.lru_cache(maxsize=None)
+def font(name, size):
+    if not pygame.font.get_init():
+        pygame.font.init()
+    return pygame.font.SysFont(name, size)
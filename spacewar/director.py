@@ -0,0 +1,142 @@
+import random
+
+# ---------------- SPAWN DIRECTOR ----------------
+def curve_at(points, t):
+    """Piecewise-linear curve through [[t, value], ...], flat past both ends."""
+    if t <= points[0][0]:
+        return points[0][1]
+    for (t0, v0), (t1, v1) in zip(points, points[1:]):
+        if t < t1:
+            return v0 + (v1 - v0) * (t - t0) / (t1 - t0)
+    return points[-1][1]
+
+class SpawnDirector:
+    """Decides what spawns, when and where.
+
+    `spawns` maps an enemy kind to its rule (None disables the kind):
+      {"rate": [[s, per_minute], ...], "cap": n}   a stream whose rate follows a
+          curve over the seconds of play; what it owes is released in waves
+          every `wave_every` ms
+      {"every": s, "cap": n}                       one at a time every s seconds,
+          skipped while the cap is full
+      {"after_kills": k, "cap": n}                 a single one, once k enemies
+          have been killed (a boss at the end of a wave)
+    Any rule can also have "until_kills": k to stop it once k enemies have
+    been killed; report kills with killed().
+    Every spawn also has to fit under `total_cap` live enemies, and while the
+    measured update cost (measure()) is over `budget_ms` streams are scaled
+    down in proportion, so a crowd the machine cannot keep up with stops
+    growing instead of turning the game into a slideshow.
+
+    Spawn points are on a ring just outside the view, `margin` to 2 * margin
+    px off its edge, so enemies walk in rather than pop up.
+    """
+    def __init__(self, spawns, wave_every=2000, total_cap=300, budget_ms=8.0, margin=40, rng=random):
+        self.spawns = {kind: rule for kind, rule in spawns.items() if rule}
+        self.wave_every = wave_every
+        self.total_cap = total_cap
+        self.budget_ms = budget_ms
+        self.margin = margin
+        self.rng = rng
+        self.cost_ms = 0.0        # smoothed update cost
+        self.spawned = {kind: 0 for kind in self.spawns}
+        self.capped = 0           # spawns dropped by a cap
+        self.throttled = 0        # waves scaled down by the budget
+        self.reset(0)
+
+    def reset(self, now):
+        self.started = now
+        self.kills = 0
+        self.after_done = set()   # "after_kills" kinds already spawned this run
+        self.next_wave = now + self.wave_every
+        self.owed = {kind: 0.0 for kind in self.spawns}
+        self.next_at = {kind: now + rule["every"] * 1000 for kind, rule in self.spawns.items() if "every" in rule}
+
+    def killed(self, n=1):
+        self.kills += n
+
+    def _stopped(self, rule):
+        return "until_kills" in rule and self.kills >= rule["until_kills"]
+
+    def measure(self, ms):
+        self.cost_ms += (ms - self.cost_ms) * 0.05
+
+    @property
+    def throttle(self):
+        """1 while under budget, falling toward 0 the further over it is."""
+        if self.budget_ms is None or self.cost_ms <= self.budget_ms:
+            return 1.0
+        return self.budget_ms / self.cost_ms
+
+    def room(self, kind, counts):
+        cap = self.spawns.get(kind, {}).get("cap")
+        free = self.total_cap - sum(counts.values())
+        if cap is not None:
+            free = min(free, cap - counts.get(kind, 0))
+        return max(0, free)
+
+    def allow(self, kind, wanted, counts):
+        """How many of `wanted` extra spawns of kind (not placed by the director,
+        such as a boss's summons) fit under the caps and budget right now."""
+        n = min(wanted, self.room(kind, counts))
+        if self.throttle < 1.0:
+            n = min(n, int(wanted * self.throttle))
+        self.capped += wanted - n
+        return n
+
+    def update(self, now, counts, view):
+        """[(kind, x, y)] to spawn this update. counts: live enemies per kind."""
+        out = []
+        seconds = (now - self.started) / 1000
+        for kind, due in self.next_at.items():
+            if now >= due:
+                self.next_at[kind] = due + self.spawns[kind]["every"] * 1000
+                if self._stopped(self.spawns[kind]):
+                    continue
+                if self.room(kind, counts):
+                    counts[kind] = counts.get(kind, 0) + 1   # charged before the streams ask for room
+                    out.append((kind,) + self.spawn_point(view))
+                else:
+                    self.capped += 1
+        for kind, rule in self.spawns.items():
+            if "after_kills" in rule and kind not in self.after_done and self.kills >= rule["after_kills"]:
+                if self.room(kind, counts):
+                    self.after_done.add(kind)
+                    counts[kind] = counts.get(kind, 0) + 1
+                    out.append((kind,) + self.spawn_point(view))
+        if now >= self.next_wave:
+            self.next_wave += self.wave_every
+            throttle = self.throttle
+            self.throttled += throttle < 1.0
+            for kind, rule in self.spawns.items():
+                if "rate" not in rule or self._stopped(rule):
+                    continue
+                self.owed[kind] += curve_at(rule["rate"], seconds) / 60 * self.wave_every / 1000 * throttle
+                wanted = int(self.owed[kind])
+                self.owed[kind] -= wanted
+                n = min(wanted, self.room(kind, counts))
+                self.capped += wanted - n
+                counts[kind] = counts.get(kind, 0) + n
+                out += [(kind,) + self.spawn_point(view) for _ in range(n)]
+        for kind, _, _ in out:
+            self.spawned[kind] += 1
+        return out
+
+    def spawn_point(self, view):
+        """Random point on a ring `margin`..2*margin px outside view."""
+        m = self.margin + self.rng.random() * self.margin
+        ring = view.inflate(2 * m, 2 * m)
+        along = self.rng.random() * 2 * (ring.width + ring.height)
+        if along < ring.width:
+            return ring.left + along, ring.top
+        along -= ring.width
+        if along < ring.height:
+            return ring.right, ring.top + along
+        along -= ring.height
+        if along < ring.width:
+            return ring.right - along, ring.bottom
+        return ring.left, ring.bottom - (along - ring.width)
+
+    def stats(self):
+        return {"spawned": dict(self.spawned), "capped": self.capped, "throttled waves": self.throttled,
+                "cost ms": round(self.cost_ms, 2)}
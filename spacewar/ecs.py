@@ -0,0 +1,242 @@
+import numpy as np
+import pygame
+from .neighbors import grid_pairs
+
+# ---------------- ENTITY COMPONENT SYSTEM ----------------
+# Entities are integer ids. Their components live in NumPy columns, one row per
+# live entity, packed with swap-remove, and a bitmask per row says which
+# components the entity has. Systems are plain functions that select the rows
+# with the components they need and update them as whole arrays.
+#
+# This is the core of the circle-based games (py5.py, py 6.py). The sprite
+# games in engine.py keep their enemies in EnemyStore, which uses the same
+# column layout but adds what those games need: pixel masks, pooled Entity
+# views, LOD and incremental grid refiling.
+
+POSITION = 1 << 0   # pos: x, y (center)
+VELOCITY = 1 << 1   # vel: pixels per update
+HEALTH   = 1 << 2   # hp
+COLLIDER = 1 << 3   # radius: circle collider
+SPRITE   = 1 << 4   # sprite: index into World.sprites
+LIFETIME = 1 << 5   # life: ms left before the entity expires
+CHASE    = 1 << 6   # speed: steer velocity toward a target at this speed
+BOUNDED  = 1 << 7   # destroyed once it leaves the play area
+
+SLOT_BITS = 24      # an id is slot | generation << SLOT_BITS
+
+class World:
+    """Column store for every entity of a game.
+
+    `kind` is a free integer tag per entity (player, bullet, enemy...) that
+    games use to pick out groups; components say what an entity has, kinds
+    say what it is.
+    """
+    COLUMNS = (
+        ("pos", np.float64, 2), ("vel", np.float64, 2), ("hp", np.float64, 1),
+        ("radius", np.float64, 1), ("sprite", np.int32, 1), ("life", np.float64, 1),
+        ("speed", np.float64, 1), ("kind", np.int32, 1), ("mask", np.int32, 1),
+        ("id", np.int64, 1),
+    )
+
+    def __init__(self, capacity=256):
+        self.n = 0
+        for name, dtype, width in self.COLUMNS:
+            shape = (capacity, width) if width > 1 else capacity
+            setattr(self, name, np.zeros(shape, dtype))
+        self.gens = []        # slot -> generation
+        self.rows = []        # slot -> row, or -1 when the slot is free
+        self.free = []
+        self.sprites = []     # sprite index -> Surface, or (colour, radius) for a plain circle
+        self._sprite_ids = {}
+
+    def __len__(self):
+        return self.n
+
+    # ---- entities ----
+    def create(self, kind=0, pos=None, vel=None, hp=None, radius=None, sprite=None, life=None, speed=None,
+               bounded=False):
+        """New entity with the given components; returns its id."""
+        if self.n == len(self.id):
+            self._grow()
+        if self.free:
+            slot = self.free.pop()
+        else:
+            slot = len(self.gens)
+            self.gens.append(0)
+            self.rows.append(-1)
+        i = self.n
+        self.n += 1
+        eid = slot | self.gens[slot] << SLOT_BITS
+        self.rows[slot] = i
+        self.id[i] = eid
+        self.kind[i] = kind
+        mask = 0
+        for bit, name, value in ((POSITION, "pos", pos), (VELOCITY, "vel", vel), (HEALTH, "hp", hp),
+                                 (COLLIDER, "radius", radius), (SPRITE, "sprite", sprite),
+                                 (LIFETIME, "life", life), (CHASE, "speed", speed)):
+            col = getattr(self, name)
+            if value is None:
+                col[i] = 0
+            else:
+                col[i] = value
+                mask |= bit
+        if bounded:
+            mask |= BOUNDED
+        self.mask[i] = mask
+        return eid
+
+    def alive(self, eid):
+        slot = eid & ((1 << SLOT_BITS) - 1)
+        return slot < len(self.gens) and self.gens[slot] == eid >> SLOT_BITS and self.rows[slot] >= 0
+
+    def row(self, eid):
+        """Current row of a live entity (rows change as others are destroyed)."""
+        if not self.alive(eid):
+            raise KeyError(eid)
+        return self.rows[eid & ((1 << SLOT_BITS) - 1)]
+
+    def destroy(self, eid):
+        if self.alive(eid):
+            self.destroy_rows([self.row(eid)])
+
+    def destroy_rows(self, rows):
+        """Destroy the entities in `rows` in one pass, highest row first so the
+        rows still to be removed are never the ones being swapped in."""
+        for i in sorted(set(int(r) for r in rows), reverse=True):
+            slot = int(self.id[i]) & ((1 << SLOT_BITS) - 1)
+            self.gens[slot] += 1
+            self.rows[slot] = -1
+            self.free.append(slot)
+            last = self.n - 1
+            if i != last:
+                for name, _, _ in self.COLUMNS:
+                    col = getattr(self, name)
+                    col[i] = col[last]
+                self.rows[int(self.id[i]) & ((1 << SLOT_BITS) - 1)] = i
+            self.n -= 1
+
+    def clear(self):
+        self.destroy_rows(range(self.n))
+
+    def _grow(self):
+        for name, _, _ in self.COLUMNS:
+            col = getattr(self, name)
+            setattr(self, name, np.concatenate([col, np.zeros_like(col)]))
+
+    # ---- queries ----
+    def select(self, components=0, kind=None):
+        """Rows of the entities that have all of `components` (and are of `kind`)."""
+        n = self.n
+        sel = (self.mask[:n] & components) == components
+        if kind is not None:
+            sel &= self.kind[:n] == kind
+        return np.flatnonzero(sel)
+
+    def count(self, kind):
+        return int(np.count_nonzero(self.kind[:self.n] == kind))
+
+    def sprite_id(self, sprite):
+        """Index for a Surface or (colour, radius) circle, registering it the first time."""
+        key = id(sprite) if isinstance(sprite, pygame.Surface) else tuple(sprite)
+        sid = self._sprite_ids.get(key)
+        if sid is None:
+            sid = self._sprite_ids[key] = len(self.sprites)
+            self.sprites.append(sprite)
+        return sid
+
+    @property
+    def nbytes(self):
+        return sum(getattr(self, name).nbytes for name, _, _ in self.COLUMNS)
+
+# ---------------- SYSTEMS ----------------
+def chase(world, tx, ty, scale=1.0):
+    """Point every CHASE entity's velocity at (tx, ty), `speed` long."""
+    rows = world.select(POSITION | VELOCITY | CHASE)
+    d = np.array([tx, ty]) - world.pos[rows]
+    dist = np.hypot(d[:, 0], d[:, 1])
+    f = np.divide(world.speed[rows] * scale, dist, out=np.zeros(len(rows)), where=dist > 0)
+    world.vel[rows] = d * f[:, None]
+
+def follow(world, field, scale=1.0):
+    """Point CHASE entities along a flow field (navigation.FlowField) wherever
+    it has a direction for their tile; the rest keep what chase() gave them."""
+    rows = world.select(POSITION | VELOCITY | CHASE)
+    d = field.directions(world.pos[rows])
+    on = d.any(axis=1)
+    rows = rows[on]
+    world.vel[rows] = d[on] * (world.speed[rows] * scale)[:, None]
+
+def move(world, scale=1.0):
+    rows = world.select(POSITION | VELOCITY)
+    world.pos[rows] += world.vel[rows] * scale
+
+def expire(world, dt_ms):
+    """Count down LIFETIME and destroy what ran out."""
+    rows = world.select(LIFETIME)
+    world.life[rows] -= dt_ms
+    world.destroy_rows(rows[world.life[rows] <= 0])
+
+def cull(world, bounds, margin=0):
+    """Destroy BOUNDED entities whose center left `bounds` by more than margin."""
+    rows = world.select(POSITION | BOUNDED)
+    p = world.pos[rows]
+    out = ((p[:, 0] < bounds.left - margin) | (p[:, 0] > bounds.right + margin) |
+           (p[:, 1] < bounds.top - margin) | (p[:, 1] > bounds.bottom + margin))
+    world.destroy_rows(rows[out])
+
+def overlaps(world, kind_a, kind_b, pad=0.0):
+    """(row_a, row_b) for every kind_a/kind_b pair whose colliders (plus `pad`)
+    overlap. Entities without a COLLIDER count as points. Pairs are ordered
+    by row_a, then by distance.
+
+    Both groups are binned into a uniform grid as wide as the largest reach,
+    so only pairs in neighbouring cells are ever measured (see neighbors.py).
+    """
+    a, b = world.select(POSITION, kind_a), world.select(POSITION, kind_b)
+    if not len(a) or not len(b):
+        return []
+    pa, pb = world.pos[a], world.pos[b]
+    ra, rb = world.radius[a], world.radius[b]
+    ia, ib = grid_pairs(pa, pb, max(ra.max() + rb.max() + pad, 1.0))
+    if not len(ia):
+        return []
+    d = pa[ia] - pb[ib]
+    dist2 = d[:, 0] ** 2 + d[:, 1] ** 2
+    reach = ra[ia] + rb[ib] + pad
+    hit = dist2 < reach * reach
+    ia, ib, dist2 = ia[hit], ib[hit], dist2[hit]
+    order = np.lexsort((dist2, ia))
+    return [(int(a[i]), int(b[j])) for i, j in zip(ia[order].tolist(), ib[order].tolist())]
+
+def match_once(pairs, key=None):
+    """Greedy one-to-one filter: each a and each b appears in at most one pair,
+    the first one it is in. So each bullet and each enemy is used up by at most
+    one hit. Sides are told apart by key(x), or by x itself (ECS rows); pass
+    key=id for unhashable entities such as the dicts bench.py's SweepAndPrune works on."""
+    used_a, used_b, out = set(), set(), []
+    for a, b in pairs:
+        ka, kb = (a, b) if key is None else (key(a), key(b))
+        if ka in used_a or kb in used_b:
+            continue
+        used_a.add(ka); used_b.add(kb)
+        out.append((a, b))
+    return out
+
+def touching(world, kind, x, y, r):
+    """Rows of `kind` whose collider overlaps the circle (x, y, r)."""
+    rows = world.select(POSITION, kind)
+    d = world.pos[rows] - (x, y)
+    reach = world.radius[rows] + r
+    return rows[d[:, 0] ** 2 + d[:, 1] ** 2 < reach * reach]
+
+def draw(world, screen, kind=None):
+    """Blit each SPRITE entity centered on its position."""
+    rows = world.select(POSITION | SPRITE, kind)
+    sprites = world.sprites
+    for (x, y), sid in zip(world.pos[rows].tolist(), world.sprite[rows].tolist()):
+        sprite = sprites[sid]
+        if isinstance(sprite, pygame.Surface):
+            screen.blit(sprite, (int(x) - sprite.get_width() // 2, int(y) - sprite.get_height() // 2))
+        else:
+            color, radius = sprite
+            pygame.draw.circle(screen, color, (int(x), int(y)), radius)
@@ -0,0 +1,275 @@
+import math
+import numpy as np
+import pygame
+from .entitylist import EntityList, Entity
+from .neighbors import grid_pairs
+
+# ---------------- ENEMY STORE ----------------
+class EnemyStore(EntityList):
+    """Structure-of-arrays storage for enemies: one NumPy column per field and
+    one row per live enemy, so per-frame work (chasing, bounds checks, damage)
+    runs as a handful of array operations instead of a Python loop.
+
+    It is an EntityList of the view objects, with each view's row at its
+    `index`: when a removal moves the last view into a freed slot, its row
+    moves with it. The store itself doubles as the game's list of enemies.
+    """
+    COLUMNS = (
+        ("x", np.float64), ("y", np.float64),      # top-left, float so slow movers keep sub-pixel progress
+        ("px", np.float64), ("py", np.float64),    # top-left before the last update, for interpolation
+        ("w", np.int32), ("h", np.int32),
+        ("speed", np.float64), ("hp", np.float64), ("damage", np.float64),
+        ("boss", np.bool_),
+        ("hx", np.float64), ("hy", np.float64),    # heading: unit vector chosen by the last steer()
+        ("due", np.bool_),                         # no heading yet; steered at the next steer() call
+        ("last", np.int64), ("phase", np.int8),    # tick of the last move, and offset for lod()
+        ("sx0", np.int32), ("sy0", np.int32),      # grid cells the row was last filed under by refile()
+        ("sx1", np.int32), ("sy1", np.int32),
+    )
+    LOD_PERIODS = (1, 2, 4)   # updates between moves: in view or a boss, off-screen, far off-screen
+    LOD_MIN = 128             # below this many enemies lod() and refile() skip their bookkeeping
+    SEPARATE_DENSE = 1024     # separate() tests every pair directly while rows * enemies is at most this
+    UNFILED = np.iinfo(np.int32).min
+
+    def __init__(self, capacity=64):
+        super().__init__()
+        for name, dtype in self.COLUMNS:
+            setattr(self, name, np.zeros(capacity, dtype))
+        self.tick = 0   # lod() calls so far
+
+    @property
+    def n(self):
+        """Rows in use, including enemies removed during a loop that still hold theirs."""
+        return len(self.items)
+
+    @property
+    def nbytes(self):
+        return sum(getattr(self, name).nbytes for name, _ in self.COLUMNS)
+
+    def _grow(self):
+        for name, _ in self.COLUMNS:
+            col = getattr(self, name)
+            setattr(self, name, np.concatenate([col, np.zeros_like(col)]))
+
+    def add(self, view, x, y, w, h, speed, hp, damage, boss=False):
+        if self.n == len(self.x):
+            self._grow()
+        i = self.n
+        self.x[i] = self.px[i] = x
+        self.y[i] = self.py[i] = y
+        self.w[i], self.h[i] = w, h
+        self.speed[i], self.hp[i], self.damage[i] = speed, hp, damage
+        self.boss[i] = boss
+        self.hx[i] = self.hy[i] = 0.0
+        self.due[i] = True
+        self.last[i] = self.tick
+        self.phase[i] = (self.tick + i) % self.LOD_PERIODS[-1]
+        self.sx0[i] = self.UNFILED
+        view.store, view.frozen = self, None
+        return super().add(view)
+
+    def _pop(self, view):
+        # The view keeps a copy of its last values so code that still holds it can read them
+        i = view.index
+        view.frozen = {name: getattr(self, name)[i].item() for name, _ in self.COLUMNS}
+        super()._pop(view)
+
+    def _move(self, src, dst):
+        for name, _ in self.COLUMNS:
+            col = getattr(self, name)
+            col[dst] = col[src]
+        super()._move(src, dst)
+
+    # ---------------- VECTORIZED PASSES ----------------
+    def snapshot(self):
+        n = self.n
+        self.px[:n] = self.x[:n]
+        self.py[:n] = self.y[:n]
+
+    def chase(self, tx, ty, scale=1.0):
+        """Move every enemy `speed * scale` pixels toward (tx, ty), center first."""
+        self.steer(tx, ty, np.arange(self.n))
+        self.advance(scale)
+
+    def steer(self, tx, ty, rows):
+        """Point the heading of `rows` (and of any enemy still without one) at (tx, ty)."""
+        n = self.n
+        pick = self.due[:n].copy()
+        pick[rows] = True
+        rows = np.flatnonzero(pick)
+        dx = tx - (self.x[rows] + self.w[rows] / 2)
+        dy = ty - (self.y[rows] + self.h[rows] / 2)
+        dist = np.hypot(dx, dy)
+        self.hx[rows] = np.divide(dx, dist, out=np.zeros(len(rows)), where=dist > 0)
+        self.hy[rows] = np.divide(dy, dist, out=np.zeros(len(rows)), where=dist > 0)
+        self.due[rows] = False
+
+    def advance(self, scale=1.0, rows=None, steps=None):
+        """Move every enemy (or just `rows`) `speed * scale` pixels along its
+        heading, times `steps` per row when they are catching up (see lod())."""
+        rows = slice(0, self.n) if rows is None else rows
+        step = self.speed[rows] * scale
+        if steps is not None:
+            step = step * steps
+        self.x[rows] += self.hx[rows] * step
+        self.y[rows] += self.hy[rows] * step
+
+    def lod(self, view, cx, cy, margin=64, far=900):
+        """Simulation level of detail. Enemies overlapping `view` (grown by
+        margin) and bosses move every update; the rest move every 2nd update,
+        or every 4th beyond `far` px from (cx, cy), taking all the steps they
+        skipped at once so their average speed is unchanged. Returns (rows,
+        steps): the rows to move this update and how many steps each is owed,
+        or (None, None) for all rows, one step each.
+        An enemy coming into view is back to full rate on the next update."""
+        self.tick += 1
+        n = self.n
+        if n < self.LOD_MIN:   # a few enemies cost less to move than to sort out
+            self.last[:n] = self.tick
+            return None, None
+        x, y, w, h = self.x[:n], self.y[:n], self.w[:n], self.h[:n]
+        near = ((x + w > view.left - margin) & (x < view.right + margin) &
+                (y + h > view.top - margin) & (y < view.bottom + margin)) | self.boss[:n]
+        full, half, quarter = self.LOD_PERIODS
+        period = np.where(near, full, np.where(np.hypot(x + w / 2 - cx, y + h / 2 - cy) < far, half, quarter))
+        # Rows moving at the same coarse rate are spread over the updates by phase
+        rows = np.flatnonzero((self.tick + self.phase[:n].astype(np.int64)) % period == 0)
+        steps = self.tick - self.last[rows]
+        self.last[rows] = self.tick
+        return rows, steps
+
+    def refile(self, grid):
+        """Bring a SpatialHashGrid up to date with the store. Cell spans are
+        worked out for every row at once and only the enemies that changed
+        cells (or are new) are refiled, so an update where most enemies stay
+        in their cells costs almost nothing."""
+        n = self.n
+        if n < self.LOD_MIN:
+            for view in self.items:
+                grid.move(view, view.rect)
+            self.sx0[:n] = self.UNFILED   # spans not tracked; the next vectorized refile redoes all
+            return
+        cs = grid.cell_size
+        left, top = np.floor(self.x[:n]).astype(np.int64), np.floor(self.y[:n]).astype(np.int64)
+        span = (left // cs, top // cs, (left + self.w[:n] - 1) // cs, (top + self.h[:n] - 1) // cs)
+        changed = np.flatnonzero((span[0] != self.sx0[:n]) | (span[1] != self.sy0[:n]) |
+                                 (span[2] != self.sx1[:n]) | (span[3] != self.sy1[:n]))
+        for view in self._views(changed):
+            grid.move(view, view.rect)
+        self.sx0[:n], self.sy0[:n], self.sx1[:n], self.sy1[:n] = span
+
+    def separate(self, spacing=0.8, strength=0.5, scale=1.0, rows=None):
+        """Boids-style separation: push apart enemies whose centers are closer
+        than `spacing` times the sum of their half-sizes, each pair by
+        `strength` of the overlap per update. The push is capped at twice the
+        enemy's speed, enough to beat its chase without jittering. Bosses push
+        minions but do not move. Given `rows`, only those are moved, and only
+        their neighborhoods are searched.
+        Neighbors come from a grid join (neighbors.py), so cost is linear in
+        the number of enemies for a given crowd density; a handful of enemies
+        skip the join and test every pair."""
+        n = self.n
+        if n < 2:
+            return
+        c = np.empty((n, 2))
+        c[:, 0] = self.x[:n] + self.w[:n] / 2
+        c[:, 1] = self.y[:n] + self.h[:n] / 2
+        r = np.maximum(self.w[:n], self.h[:n]) / 2 * spacing
+        # Pairs (i, j) for every enemy i being moved and each neighbor j
+        rows = np.arange(n) if rows is None else np.asarray(rows)
+        if len(rows) * n <= self.SEPARATE_DENSE:
+            a, j = np.repeat(np.arange(len(rows)), n), np.tile(np.arange(n), len(rows))
+        else:
+            a, j = grid_pairs(c[rows], c, max(2 * r.max(), 1.0))
+        i = rows[a]
+        d = c[i] - c[j]
+        dist = np.hypot(d[:, 0], d[:, 1])
+        reach = r[i] + r[j]
+        near = (dist < reach) & (i != j)
+        i, j, d, dist, reach = i[near], j[near], d[near], dist[near], reach[near]
+        if not len(i):
+            return
+        # Coincident pairs get pushed apart sideways, in opposite directions
+        same = dist == 0
+        d[same, 0] = np.where(i[same] < j[same], 1.0, -1.0)
+        dist[same] = 1.0
+        push = (reach - dist) / dist * strength
+        # i takes its share of the push; a boss takes none unless both are bosses
+        movable = (~self.boss[:n]).astype(np.float64)
+        wi, wj = movable[i], movable[j]
+        both = wi + wj
+        share = np.divide(wi, both, out=np.full(len(i), 0.5), where=both > 0) * push
+        mx = np.bincount(i, d[:, 0] * share, n)[rows]
+        my = np.bincount(i, d[:, 1] * share, n)[rows]
+        size = np.hypot(mx, my)
+        cap = 2 * self.speed[rows] * scale
+        f = np.divide(cap, size, out=np.ones(len(rows)), where=size > cap)
+        self.x[rows] += mx * f
+        self.y[rows] += my * f
+
+    def overlapping(self, rect):
+        """Views whose rect overlaps rect, from one bounds check over all rows."""
+        n = self.n
+        x, y = np.floor(self.x[:n]), np.floor(self.y[:n])
+        rows = np.flatnonzero((x < rect.right) & (x + self.w[:n] > rect.left) &
+                              (y < rect.bottom) & (y + self.h[:n] > rect.top))
+        return self._views(rows)
+
+    def hurt(self, views, amount):
+        """Take `amount` hp from each view in one array update."""
+        rows = [v.index for v in views]
+        self.hp[rows] -= amount
+
+    def rows_where(self, mask):
+        return self._views(np.flatnonzero(mask[:self.n]))
+
+    def _views(self, rows):
+        items, doomed = self.items, self._doomed
+        return [items[i] for i in rows if not doomed or items[i] not in doomed]
+
+    def bosses(self):
+        return self.rows_where(self.boss)
+
+def _column(name):
+    def get(self):
+        if self.index is None:
+            return self.frozen[name]
+        return getattr(self.store, name)[self.index].item()
+    def set(self, value):
+        if self.index is None:
+            self.frozen[name] = value
+        else:
+            getattr(self.store, name)[self.index] = value
+    return property(get, set)
+
+class EnemyView(Entity):
+    """An enemy as seen by game code: attribute access reads and writes its row."""
+    __slots__ = ("store", "frozen")
+    hp = _column("hp")
+    speed = _column("speed")
+    damage = _column("damage")
+    boss = _column("boss")
+
+    x = _column("x")
+    y = _column("y")
+    w = _column("w")
+    h = _column("h")
+
+    @property
+    def rect(self):
+        if self.index is None:
+            f = self.frozen
+            return pygame.Rect(math.floor(f["x"]), math.floor(f["y"]), f["w"], f["h"])
+        s, i = self.store, self.index
+        return pygame.Rect(math.floor(s.x[i]), math.floor(s.y[i]), int(s.w[i]), int(s.h[i]))
+
+    @rect.setter
+    def rect(self, rect):
+        self.x, self.y, self.w, self.h = rect
+
+    @property
+    def prev(self):
+        if self.index is None:
+            return math.floor(self.frozen["px"]), math.floor(self.frozen["py"])
+        s, i = self.store, self.index
+        return math.floor(s.px[i]), math.floor(s.py[i])
@@ -0,0 +1,888 @@
+import pygame
+import time
+import random
+import math
+from .gameclock import GameClock
+from .spatial import SpatialHashGrid
+from .masks import mask_of, rotation_step, hit, hit_along
+from .enemystore import EnemyStore, EnemyView
+from .entitylist import EntityList, Entity
+from .pool import Pool, POOLS
+from .memreport import MemoryWatch, entity_table, instance_bytes, format_report
+from .aischeduler import AIScheduler
+from .director import SpawnDirector
+from .timerwheel import TimerWheel
+from .variants import DEFAULTS, load_variant
+from . import assets
+
+# Importing the engine does no pygame work. setup() opens the window for one
+# variant (see variants/) and loads that variant's images and fonts; the names
+# below are filled in there.
+VARIANT = None
+SCREEN_WIDTH, SCREEN_HEIGHT = 1300, 750
+SCREEN = BACKGROUND = PLAYER_IMG = BULLET_IMG = BOSS_IMG = MINION_IMG = XP_GEM_IMG = HEART_IMG = ORB_IMG = None
+FONT = SMALL = None
+GEM_IMGS = []   # XP gem sprite per value tier, made by setup()
+# Gameplay settings a variant can change
+FIRE, SHOOT_DELAY, EXPLOSION_DAMAGE_STEP, LIFE_STEAL_STEP, BOSS_ENDS_RUN = "tap", 1000, 1, 0.05, False
+BOSS = DEFAULTS["boss"]   # boss hp, speed, contact damage and whether it has a phase 2
+SEPARATION = 0.5   # how hard overlapping enemies push apart per update; 0 lets them stack
+LOD_MARGIN, LOD_FAR = 64, 900   # enemies this far outside the screen move at half rate, this far from the player at quarter
+
+# Enemy decisions (where to head, boss phase changes) are made for a quarter of
+# the enemies each update; in between they keep steering along what they chose.
+ai = AIScheduler(buckets=4, budget_ms=2.0)
+
+# What spawns, when and where is up to the director, from the variant's "spawns" rules
+director = SpawnDirector(DEFAULTS["spawns"])
+
+# Cooldowns and status effects are timers on one wheel, turned once per update
+# in game time, instead of every object comparing timestamps every update.
+# Everything on it is dropped by start_game().
+timers = TimerWheel(tick_ms=10)
+
+# Colors
+WHITE, BLACK = (255, 255, 255), (0, 0, 0)
+RED, GREEN, GRAY, DARK_GRAY = (200, 0, 0), (0, 200, 0), (150, 150, 150), (80, 80, 80)
+YELLOW, BLUE, PINK, PURPLE, ORANGE = (255, 255, 0), (50, 150, 255), (255, 100, 150), (180, 0, 180), (255, 165, 0)
+
+# Game states
+MENU, GAME, LEVEL_UP, GAME_OVER = "menu", "game", "level_up", "game_over"
+game_state = MENU
+
+# Game time in ms. Runs in fixed steps and stops outside GAME, so every cooldown
+# and timer below is independent of frame rate and of time spent in menus.
+# SIM_HZ can be lowered (e.g. 30) on slow machines; draw() interpolates between
+# updates so motion stays smooth at the display rate.
+SIM_HZ = 60
+DISPLAY_FPS = 60
+game_clock = GameClock(1000/SIM_HZ)
+STEP = 60/SIM_HZ  # speeds below are tuned in pixels per 1/60 s; scale by this per update
+def ticks():
+    return game_clock.now()
+
+def set_sim_rate(hz):
+    global SIM_HZ, STEP
+    SIM_HZ, STEP = hz, 60/hz
+    game_clock.step_ms = 1000/hz
+
+def interp_rect(ent, alpha):
+    """ent.rect placed between its previous and current update positions."""
+    px, py = ent.prev
+    t = 1 - alpha
+    return ent.rect.move(round((px-ent.rect.x)*t), round((py-ent.rect.y)*t))
+
+# ---------------- BUTTON CLASS ----------------
+class Button:
+    def __init__(self, text, x, y, w, h, color, hover_color, action=None, disabled=False):
+        self.text = text
+        self.rect = pygame.Rect(x, y, w, h)
+        self.color = color
+        self.hover_color = hover_color
+        self.action = action
+        self.disabled = disabled
+
+    def draw(self, screen):
+        mouse = pygame.mouse.get_pos()
+        if self.disabled:
+            pygame.draw.rect(screen, DARK_GRAY, self.rect)
+        elif self.rect.collidepoint(mouse):
+            pygame.draw.rect(screen, self.hover_color, self.rect)
+        else:
+            pygame.draw.rect(screen, self.color, self.rect)
+        color = WHITE if not self.disabled else GRAY
+        surf = SMALL.render(self.text, True, color) if len(self.text) > 18 else FONT.render(self.text, True, color)
+        screen.blit(surf, surf.get_rect(center=self.rect.center))
+
+    def click(self, event):
+        if self.disabled:
+            return
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            if self.rect.collidepoint(event.pos) and self.action:
+                self.action()
+
+# ---------------- PLAYER CLASS ----------------
+# Entity classes use __slots__: no per-instance __dict__, which adds up over a
+# long run. Run with --mem-report or press F2 to measure.
+class Player:
+    __slots__ = ("x", "y", "rect", "mask", "prev", "speed", "level", "xp", "xp_to_next", "damage", "max_hp", "hp",
+                 "xp_multiplier", "magnet_radius", "image", "life_steal", "multishot", "bullet_effect", "orb_effect")
+
+    def __init__(self, x, y):
+        # Collision rect covers the drawn sprite; the mask trims it to the visible pixels
+        self.rect = pygame.Rect((x, y), PLAYER_IMG.get_size() if PLAYER_IMG else (40, 40))
+        self.x, self.y = float(self.rect.x), float(self.rect.y)   # exact position; rect is it rounded
+        self.mask = mask_of(PLAYER_IMG)
+        self.prev = self.rect.topleft
+        self.speed = 5
+        self.level = 1
+        self.xp = 0
+        self.xp_to_next = 5
+        self.damage = 1
+        self.max_hp = 5
+        self.hp = self.max_hp
+        self.xp_multiplier = 1.0
+        self.magnet_radius = 0
+        self.image = PLAYER_IMG
+        self.life_steal = 0.0
+        self.multishot = 1
+        self.bullet_effect = None   # status effects bullets and orbs leave on what they hit
+        self.orb_effect = None
+
+    def move(self, keys):
+        if keys[pygame.K_w] or keys[pygame.K_UP]:
+            self.y -= self.speed*STEP
+        if keys[pygame.K_s] or keys[pygame.K_DOWN]:
+            self.y += self.speed*STEP
+        if keys[pygame.K_a] or keys[pygame.K_LEFT]:
+            self.x -= self.speed*STEP
+        if keys[pygame.K_d] or keys[pygame.K_RIGHT]:
+            self.x += self.speed*STEP
+        bounds = SCREEN.get_rect()
+        self.x = min(max(self.x, bounds.left), bounds.right - self.rect.width)
+        self.y = min(max(self.y, bounds.top), bounds.bottom - self.rect.height)
+        self.rect.topleft = (round(self.x), round(self.y))
+
+    def draw(self, screen, alpha=1.0):
+        rect = interp_rect(self, alpha)
+        if self.image:
+            screen.blit(self.image, rect)
+        else:
+            pygame.draw.rect(screen, GREEN, rect)
+        # HP bar
+        pygame.draw.rect(screen, RED, (10, 40, 200, 20))
+        hp_ratio = self.hp / self.max_hp
+        pygame.draw.rect(screen, GREEN, (10, 40, 200 * hp_ratio, 20))
+
+    def add_xp(self, amount):
+        """Returns the number of levels gained; a merged gem can be worth several."""
+        gained = int(amount * self.xp_multiplier)
+        self.xp += gained
+        levels = 0
+        while self.xp >= self.xp_to_next:
+            self.xp -= self.xp_to_next
+            self.level += 1
+            self.xp_to_next = int(self.xp_to_next * 1.5)
+            levels += 1
+        return levels
+
+    def take_damage(self, amount):
+        self.hp -= amount
+        return self.hp <= 0
+
+    def heal(self, amount):
+        self.hp = min(self.max_hp, self.hp + amount)
+
+# ---------------- ENEMY CLASS ----------------
+# All enemies live as rows of one array store; Enemy and Boss objects are views
+# onto their row, and the store is the list of live enemies.
+enemy_store = EnemyStore()
+
+def enemy_counts():
+    """Live enemies per spawn kind, for the director's caps."""
+    bosses = len(enemy_store.bosses())
+    return {"minion": len(enemy_store) - bosses, "boss": bosses}
+
+class Enemy(EnemyView):
+    __slots__ = ("mask", "color", "timers")
+
+    def __init__(self, x, y, strength, boss=False):
+        self.reset(x, y, strength, boss)
+
+    @staticmethod
+    def size_of(boss=False):
+        """Hitbox size: the sprite's, or a plain square when there is none."""
+        image = BOSS_IMG if boss else MINION_IMG
+        size = 30 if not boss else 100
+        return image.get_size() if image else (size, size)
+
+    def reset(self, x, y, strength, boss=False):
+        w, h = self.size_of(boss)
+        self.mask = mask_of(BOSS_IMG if boss else MINION_IMG)
+        self.color = RED if not boss else PURPLE
+        self.timers = {}   # name -> this enemy's Timer on the wheel, cancelled when it dies
+        enemy_store.add(self, x, y, w, h, speed=2 + strength * 0.1, hp=(2 + strength) * (5 if boss else 1),
+                        damage=1 if not boss else 2, boss=boss)
+
+    def move_towards_player(self, player):
+        # Single-enemy version of enemy_store.chase()
+        dx, dy = player.rect.centerx - (self.x + self.w / 2), player.rect.centery - (self.y + self.h / 2)
+        dist = math.hypot(dx, dy)
+        if dist > 0:
+            dx, dy = dx / dist, dy / dist
+            self.x += dx * self.speed*STEP
+            self.y += dy * self.speed*STEP
+
+    def draw(self, screen, alpha=1.0):
+        rect = interp_rect(self, alpha)
+        if not self.boss and MINION_IMG:
+            screen.blit(MINION_IMG, rect)
+        elif self.boss and BOSS_IMG:
+            screen.blit(BOSS_IMG, rect)
+
+Enemy.pool = Pool(Enemy)
+
+class Boss(Enemy):
+    __slots__ = ("max_hp", "phase", "spawn_cd", "color_phase1", "color_phase2")
+    pool = None  # one at a time, not worth recycling
+
+    def __init__(self, x, y, strength):
+        super().__init__(x, y, strength, boss=True)
+        self.max_hp = BOSS["hp"][0] + strength * BOSS["hp"][1]
+        self.hp = self.max_hp
+        self.speed = BOSS["speed"][0] + strength * BOSS["speed"][1]
+        self.damage = BOSS["damage"]
+        self.phase = 1
+        self.spawn_cd = 3000
+        self.color_phase1 = PURPLE
+        self.color_phase2 = ORANGE  # Phase 2 color
+
+    def update(self, strength):
+        # Movement happens in enemy_store.advance() with everyone else; this runs
+        # once per ai.buckets updates
+        if BOSS["phase2"] and self.hp < self.max_hp // 2 and self.phase == 1:
+            self.phase = 2
+            self.speed += 1.0
+            self.damage += 5
+            self.summon()
+            self.timers["summon"] = timers.every(self.spawn_cd, for_enemy, self.handle, Boss.summon)
+
+    def summon(self):
+        for _ in range(director.allow("minion", 3, enemy_counts())):
+            ex = self.rect.centerx + random.randint(-80, 80)
+            ey = self.rect.centery + random.randint(-80, 80)
+            Enemy.pool.acquire(ex, ey, strength)
+
+    def draw(self, screen, alpha=1.0):
+        if BOSS_IMG:
+            screen.blit(BOSS_IMG, interp_rect(self, alpha))
+        # HP bar
+        bar_w = 300
+        ratio = max(0, self.hp / self.max_hp)
+        pygame.draw.rect(screen, RED, (SCREEN_WIDTH // 2 - bar_w // 2, 70, bar_w, 20))
+        pygame.draw.rect(screen, GREEN, (SCREEN_WIDTH // 2 - bar_w // 2, 70, int(bar_w * ratio), 20))
+        text = SMALL.render("BOSS", True, WHITE)
+        screen.blit(text, (SCREEN_WIDTH // 2 - text.get_width() // 2, 50))
+
+
+# ---------------- BULLET, ORB, EXPLOSION ----------------
+class Bullet(Entity):
+    __slots__ = ("x", "y", "dx", "dy", "speed", "damage", "sprite_key", "image", "rect", "mask", "prev")
+    swept = True  # test the whole path of each move, not just where it ends
+
+    def __init__(self, x, y, dx, dy, dmg):
+        self.sprite_key = None   # (source image, rotation step) of image and mask
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.reset(x, y, dx, dy, dmg)
+
+    def reset(self, x, y, dx, dy, dmg):
+        self.x, self.y = x, y
+        self.dx, self.dy = dx, dy
+        self.speed = 7
+        self.damage = dmg
+        angle = math.degrees(math.atan2(-dy, dx))
+        key = (BULLET_IMG, rotation_step(angle))
+        if key != self.sprite_key:  # a recycled bullet fired (about) the same way keeps its sprite
+            self.sprite_key = key
+            self.image = assets.rotated(BULLET_IMG, angle)
+            self.mask = assets.rotated_mask(BULLET_IMG, angle)
+        self.rect.size = self.image.get_size()
+        self.rect.center = (int(x), int(y))
+        self.prev = self.rect.topleft
+
+    def move(self, grid=None):
+        """Advance one update. Given an enemy grid, returns the enemy hit on the
+        way (or None). In swept mode the earliest hit along the move wins and the
+        bullet stops there, so fast bullets and long steps cannot tunnel."""
+        vx, vy = self.dx * self.speed*STEP, self.dy * self.speed*STEP
+        target = None
+        if grid is not None and self.swept:
+            best = 1.0
+            for t0, t1, en in grid.sweep(self.rect, vx, vy):
+                if t0 > best:
+                    break
+                t = hit_along(self, en, vx, vy, t0, min(t1, best))
+                if t is not None and (target is None or t < best):
+                    target, best = en, t
+            if target is not None:
+                vx, vy = vx*best, vy*best
+        self.x += vx; self.y += vy
+        self.rect.center = (int(self.x), int(self.y))
+        if grid is not None and not self.swept:
+            target = next((en for en in grid.query(self.rect) if hit(self, en)), None)
+        return target
+
+    def draw(self, s, alpha=1.0):
+        img_rect = self.image.get_rect(center=interp_rect(self, alpha).center)
+        s.blit(self.image, img_rect)
+
+Bullet.pool = Pool(Bullet)
+
+class OrbitingOrb:
+    __slots__ = ("player", "radius", "angle", "speed", "damage", "size", "rect", "mask", "prev")
+
+    def __init__(self, player, radius=60, speed=0.05, damage=1):
+        self.player = player
+        self.radius = radius
+        self.angle = 0
+        self.speed = speed
+        self.damage = damage
+        self.size = 15
+        self.rect = pygame.Rect(0, 0, self.size, self.size)
+        self.mask = mask_of(ORB_IMG)
+        self.update(0)
+        self.prev = self.rect.topleft
+
+    def update(self, step=None):
+        self.angle += self.speed * (STEP if step is None else step)
+        cx, cy = self.player.rect.center
+        self.rect.centerx = int(cx + math.cos(self.angle) * self.radius)
+        self.rect.centery = int(cy + math.sin(self.angle) * self.radius)
+
+    def draw(self, s, alpha=1.0):
+        img_rect = ORB_IMG.get_rect(center=interp_rect(self, alpha).center)
+        s.blit(ORB_IMG, img_rect)
+
+class ExplosionSpell:
+    """Goes off around the player every `cooldown` ms, on its own timer."""
+    def __init__(self, player, store, grid, cooldown=4000, radius=100, damage=2):
+        self.player = player
+        self.store, self.grid = store, grid
+        self.cooldown = cooldown
+        self.radius = radius
+        self.damage = damage
+        self.effect = None   # status effect left on what it hits
+        self.active = False
+        self.duration = 500
+        timers.every(self.cooldown, self.cast)
+
+    def cast(self):
+        self.active = True
+        timers.after(self.duration, self.fade)
+        cx, cy = self.player.rect.center
+        hits = self.grid.in_circle(cx, cy, self.radius)
+        if hits:
+            self.store.hurt(hits, self.damage)
+            self.player.hp = min(self.player.max_hp, self.player.hp + sum(e.damage for e in hits)*self.player.life_steal)
+        for e in hits:
+            if e.hp <= 0: kill(e)
+            elif self.effect: afflict(e, self.effect)
+
+    def fade(self):
+        self.active = False
+
+    def draw(self, screen):
+        if self.active:
+            pygame.draw.circle(screen, (255, 100, 0), self.player.rect.center, self.radius, 3)
+
+class LaserBeam:
+    """Piercing beam toward the nearest enemy. While active it is re-cast every
+    update and damages up to `pierce` enemies along it, closest first."""
+    def __init__(self, player, cooldown=3000, duration=400, length=700, damage=1, pierce=3):
+        self.player = player
+        self.cooldown = cooldown
+        self.duration = duration
+        self.length = length
+        self.damage = damage
+        self.pierce = pierce
+        self.ready = False   # set by the cooldown timer; the beam then waits for a target
+        self.active = False
+        self.direction = (1, 0)
+        self.end = player.rect.center
+        timers.after(self.cooldown, self.reload)
+
+    def reload(self):
+        self.ready = True
+
+    def stop(self):
+        self.active = False
+
+    def update(self, grid):
+        cx, cy = self.player.rect.center
+        if self.ready:
+            target = grid.nearest_within(cx, cy, self.length)
+            if target is None:
+                return
+            dx, dy = target.rect.centerx - cx, target.rect.centery - cy; d = math.hypot(dx, dy)
+            if d == 0:
+                return
+            self.direction = (dx / d, dy / d)
+            self.ready, self.active = False, True
+            timers.after(self.duration, self.stop)
+            timers.after(self.cooldown, self.reload)
+        if not self.active:
+            return
+        ex, ey = cx + self.direction[0] * self.length, cy + self.direction[1] * self.length
+        hits = grid.raycast(cx, cy, ex, ey, self.pierce)
+        self.end = (ex, ey)
+        if len(hits) == self.pierce:
+            # Beam stops at the last enemy it is allowed to pierce
+            t = hits[-1][0]
+            self.end = (cx + (ex - cx) * t, cy + (ey - cy) * t)
+        for _, e in hits:
+            e.hp -= self.damage * STEP * 0.1
+            if e.hp <= 0: kill(e)
+
+    def draw(self, screen):
+        if self.active:
+            pygame.draw.line(screen, BLUE, self.player.rect.center, self.end, 4)
+            pygame.draw.line(screen, WHITE, self.player.rect.center, self.end, 1)
+
+# ---------------- GEMS & HEARTS ----------------
+# Gems carry an XP value. Too many in one spot, or too many on the field, and
+# they merge into one gem worth their total, so the gem count (and the cost of
+# drawing and picking them up) stays bounded however long a run goes.
+GEM_TIERS = (1, 5, 25, 125)   # value from which each sprite tier is used
+GEM_TINTS = ((255, 255, 255), (120, 255, 120), (120, 180, 255), (255, 120, 255))
+GEM_CELL_MAX = 6              # a drop that leaves more gems than this around it merges them
+GEM_CAP = 150                 # past this many gems the most crowded spot merges
+
+class XPGem(Entity):
+    __slots__ = ("x", "y", "rect", "value", "tier")
+    def __init__(self, x, y, value=1):
+        self.rect = pygame.Rect(x, y, 12, 12)
+        self.reset(x, y, value)
+    def reset(self, x, y, value=1):
+        self.value = value
+        self.tier = sum(value >= t for t in GEM_TIERS) - 1
+        self.rect.size = (12 + 4 * self.tier, 12 + 4 * self.tier)
+        self.x, self.y = x, y   # exact position for the magnet pull; rect is it rounded
+        self.rect.topleft = (round(x), round(y))
+    def draw(self, s):
+        s.blit(GEM_IMGS[self.tier], self.rect)
+class Heart(Entity):
+    __slots__ = ("rect",)
+    def __init__(self, x, y):
+        self.rect = pygame.Rect(x, y, 14, 14)
+    def reset(self, x, y):
+        self.rect.topleft = (x, y)
+    def draw(self, s):
+        s.blit(HEART_IMG, self.rect)
+XPGem.pool = Pool(XPGem)
+Heart.pool = Pool(Heart)
+
+def drop_gem(x, y, value=1):
+    g = XPGem.pool.acquire(x, y, value); gems.add(g); gem_grid.insert(g, g.rect)
+    crowd = gem_grid.query(g.rect)
+    if len(crowd) > GEM_CELL_MAX: merge_gems(crowd)
+    elif len(gems) > GEM_CAP: merge_crowded()
+
+def merge_gems(group):
+    """Replace the gems in group with one worth their total, where they were on average."""
+    value = sum(g.value for g in group)
+    x = sum(g.rect.x for g in group) // len(group)
+    y = sum(g.rect.y for g in group) // len(group)
+    for g in group:
+        gems.remove(g); gem_grid.remove(g)
+    drop_gem(x, y, value)
+
+def merge_crowded():
+    """Merge the gems of the most crowded grid cell, widening the cells until
+    one holds two or more."""
+    size = gem_grid.cell_size
+    while True:
+        spots = {}
+        for g in gems: spots.setdefault((g.rect.x // size, g.rect.y // size), []).append(g)
+        group = max(spots.values(), key=len)
+        if len(group) > 1:
+            merge_gems(group)
+            return
+        size *= 2
+
+def drop_heart(x, y):
+    h = Heart.pool.acquire(x, y); hearts.add(h); heart_grid.insert(h, h.rect)
+
+# ---------------- DEATHS ----------------
+# Anything that kills an enemy queues it with kill(); resolve_deaths() then
+# handles every death of the update in one place. Queued enemies leave the
+# grid at once, so nothing later in the same update can hit them again.
+HEART_CHANCE = 0.2
+deaths = {}   # enemy -> drops loot?, in the order they died
+
+def kill(en, loot=True):
+    if en not in deaths:
+        deaths[en] = loot
+        enemy_grid.remove(en)
+
+def resolve_deaths():
+    global game_state, boss_rewards
+    for en, loot in deaths.items():
+        if isinstance(en, Boss):
+            # The boss pays out in upgrades instead of loot (unless the player died
+            # too), or, where the variant says so, ends the run
+            if BOSS_ENDS_RUN:
+                game_state = GAME_OVER
+            elif game_state != GAME_OVER:
+                boss_rewards += 1
+        elif loot:
+            director.killed()
+            drop_gem(en.rect.x, en.rect.y)
+            if random.random() < HEART_CHANCE:
+                drop_heart(en.rect.x, en.rect.y)
+        for t in en.timers.values(): t.cancel()
+        enemy_store.remove(en)
+    deaths.clear()
+    next_level_up()
+
+# ---------------- STATUS EFFECTS ----------------
+# Each afflicted enemy has one timer per effect on the wheel, so thousands of
+# burning enemies cost only the ticks that are actually due. An effect that is
+# already running is left as it is rather than stacked or restarted.
+EFFECTS = {
+    "burn":   {"damage": 1,   "every": 250, "times": 8},
+    "poison": {"damage": 0.5, "every": 500, "times": 12},
+    "slow":   {"factor": 0.5, "duration": 2000},
+}
+
+def afflict(en, kind):
+    running = en.timers.get(kind)
+    if (running and not running.cancelled) or en in deaths:
+        return
+    fx = EFFECTS[kind]
+    if kind == "slow":
+        cut = en.speed * (1 - fx["factor"])
+        en.speed -= cut
+        en.timers[kind] = timers.after(fx["duration"], for_enemy, en.handle, unslow, cut)
+    else:
+        en.timers[kind] = timers.every(fx["every"], for_enemy, en.handle, hurt_over_time, fx["damage"],
+                                       times=fx["times"])
+
+def for_enemy(handle, action, *args):
+    """Timer callback: action(enemy, *args) if the enemy behind handle is still
+    alive. Enemy objects are pooled, so a timer holds the handle rather than the
+    object, which may be a different enemy by the time the timer fires."""
+    en = enemy_store.get(handle)
+    if en is not None and en not in deaths:
+        action(en, *args)
+
+def hurt_over_time(en, damage):
+    en.hp -= damage
+    if en.hp <= 0: kill(en)
+
+def unslow(en, cut):
+    en.speed += cut
+
+#---------------- UPGRADES ----------------
+def upgrade_fire_rate():  global shoot_delay, game_state; shoot_delay = max(200, int(shoot_delay * 0.8)); game_state = GAME
+def upgrade_damage():     global player, orbiting_orbs, explosion_spell, game_state; player.damage += 1; [setattr(o,"damage",o.damage+1) for o in orbiting_orbs]; explosion_spell.damage += 1; game_state = GAME
+def upgrade_speed():      global player, game_state; player.speed += 1; game_state = GAME
+def upgrade_orb():        global orbiting_orbs, player, game_state; orbiting_orbs.append(OrbitingOrb(player, 60+20*len(orbiting_orbs))) if len(orbiting_orbs)<3 else [setattr(o,"damage",o.damage+1) for o in orbiting_orbs]; game_state = GAME
+def upgrade_max_hp():     global player, game_state; player.max_hp += 2; player.hp = player.max_hp; game_state = GAME
+def upgrade_xp_boost():   global player, game_state; player.xp_multiplier += 0.25; game_state = GAME
+def upgrade_magnet():     global player, game_state; player.magnet_radius += 50; game_state = GAME
+def upgrade_explosion():  global explosion_spell, game_state; explosion_spell.damage += EXPLOSION_DAMAGE_STEP; game_state = GAME
+def upgrade_orb_speed():  global orbiting_orbs, game_state; [setattr(o,"speed",o.speed+0.02) for o in orbiting_orbs]; game_state=GAME
+def upgrade_life_steal(): global player, game_state; player.life_steal += LIFE_STEAL_STEP; game_state=GAME
+def upgrade_laser():      global laser_beam, player, game_state; laser_beam = LaserBeam(player) if laser_beam is None else [setattr(laser_beam,"damage",laser_beam.damage+1), setattr(laser_beam,"pierce",laser_beam.pierce+2)] and laser_beam; game_state=GAME
+def upgrade_multishot():  global player, game_state; player.multishot = min(5, player.multishot+1); game_state=GAME
+def upgrade_burn():       global explosion_spell, game_state; explosion_spell.effect = "burn"; game_state=GAME
+def upgrade_poison():     global player, game_state; player.bullet_effect = "poison"; game_state=GAME
+def upgrade_frost():      global player, game_state; player.orb_effect = "slow"; game_state=GAME
+
+UPGRADES = [
+    {"name": "Increase Fire Rate", "func": upgrade_fire_rate, "rarity": "Common"},
+    {"name": "Increase Damage", "func": upgrade_damage, "rarity": "Common"},
+    {"name": "Increase Speed", "func": upgrade_speed, "rarity": "Common"},
+    {"name": "Add/Upgrade Orb", "func": upgrade_orb, "rarity": "Rare"},
+    {"name": "Max HP Boost",    "func": upgrade_max_hp, "rarity": "Rare"},
+    {"name": "XP Boost",        "func": upgrade_xp_boost, "rarity": "Rare"},
+    {"name": "Magnet Radius",   "func": upgrade_magnet, "rarity": "Epic"},
+    {"name": "Explosion Damage+", "func": upgrade_explosion, "rarity": "Rare"},
+    {"name": "Orb Speed+",      "func": upgrade_orb_speed, "rarity": "Rare"},
+    {"name": "Life Steal",      "func": upgrade_life_steal, "rarity": "Epic"},
+    {"name": "Multishot",       "func": upgrade_multishot, "rarity": "Epic"},
+    {"name": "Laser Beam",      "func": upgrade_laser, "rarity": "Epic"},
+    {"name": "Burning Explosion", "func": upgrade_burn, "rarity": "Rare"},
+    {"name": "Poison Bullets",  "func": upgrade_poison, "rarity": "Rare"},
+    {"name": "Frost Orbs",      "func": upgrade_frost, "rarity": "Rare"},
+]
+UPGRADE_POOL = list(UPGRADES)   # the ones the variant offers, set by setup()
+
+RARITY_COLOR = {"Common": GREEN, "Rare": ORANGE, "Epic": PURPLE}
+
+def build_levelup_buttons():
+    return [Button(up["name"], SCREEN_WIDTH//2-200, 220+80*i, 400, 50, RARITY_COLOR[up["rarity"]], GRAY, action=pick(up["func"])) for i,up in enumerate(random.sample(UPGRADE_POOL,3))]
+
+def pick(upgrade):
+    """Button action: apply the upgrade, then offer the next level-up still owed."""
+    def action():
+        upgrade()
+        next_level_up()
+    return action
+
+def next_level_up():
+    """Open the next level-up screen still owed, boss rewards first. Owed
+    screens wait while one is already open; pick() comes back here."""
+    global pending_levels, boss_rewards, upgrade_buttons, game_state
+    if game_state!=GAME: return
+    if boss_rewards:
+        boss_rewards -= 1
+        upgrade_buttons = build_levelup_buttons() + [Button("Boss Reward!", SCREEN_WIDTH//2-200, 220+80*3, 400, 50, PURPLE, GRAY, action=pick(random.choice(UPGRADE_POOL)["func"]))]
+        game_state = LEVEL_UP
+    elif pending_levels:
+        pending_levels -= 1
+        upgrade_buttons = build_levelup_buttons(); game_state = LEVEL_UP
+
+# ---------------- GAME FUNCTIONS ----------------
+def start_game():
+    global game_state, player, orbiting_orbs, explosion_spell, laser_beam, shoot_delay, gun_ready, strength, start_time, upgrade_buttons, pending_levels, boss_rewards
+    game_state = GAME
+    player = Player(SCREEN_WIDTH//2, SCREEN_HEIGHT//2)
+    for group in (enemies, bullets, gems, hearts): group.clear()
+    enemy_grid.clear(); gem_grid.clear(); heart_grid.clear()
+    start_time = ticks()
+    timers.reset(start_time)
+    orbiting_orbs = [OrbitingOrb(player)]
+    explosion_spell = ExplosionSpell(player, enemy_store, enemy_grid)
+    laser_beam = None
+    shoot_delay, gun_ready, strength = SHOOT_DELAY, True, 0
+    director.reset(start_time)
+    upgrade_buttons = []
+    pending_levels = boss_rewards = 0
+
+def reload_gun():
+    global gun_ready
+    gun_ready = True
+
+def back_to_menu():
+    global game_state
+    game_state = MENU
+
+start_btn = menu_btn = None   # made by setup(), centred on the variant's screen
+
+# ---------------- GLOBALS ----------------
+player=None; enemies=enemy_store; bullets=EntityList(); gems=EntityList(); hearts=EntityList(); orbiting_orbs=[]; explosion_spell=None; laser_beam=None
+shoot_delay=1000; gun_ready=True; strength=0; start_time=0; upgrade_buttons=[]; pending_levels=0; boss_rewards=0
+elapsed=0
+# Range-query indexes; enemies are refiled every update (only those that changed cells), gems and hearts as they change
+enemy_grid = SpatialHashGrid(64)
+gem_grid = SpatialHashGrid(64)
+heart_grid = SpatialHashGrid(64)
+
+# ---------------- MEMORY REPORT ----------------
+mem_watch = MemoryWatch(clock=ticks)
+
+def memory_report():
+    """Bytes per entity type and in total, then tracemalloc growth since the
+    first report (or since launch with --mem-report)."""
+    rows = entity_table({
+        "Player": [player] if player else [], "Enemy": [en for en in enemies if not en.boss],
+        "Boss": enemy_store.bosses(), "Bullet": bullets, "OrbitingOrb": orbiting_orbs,
+        "XPGem": gems, "Heart": hearts})
+    extra = [("enemy columns", enemy_store.nbytes)]
+    extra += [(f"{p.name} pool free", sum(instance_bytes(o) for o in p.free)) for p in POOLS]
+    return format_report(rows, extra, mem_watch.check())
+
+# ---------------- INPUT ----------------
+class KeySet:
+    """Stand-in for pygame.key.get_pressed() so input can be injected."""
+    def __init__(self, keys=()):
+        self.keys = set(keys)
+
+    def __getitem__(self, key):
+        return key in self.keys
+
+class Inputs:
+    def __init__(self, pressed=None, just_pressed=None, upgrade=None):
+        self.pressed = pressed if pressed is not None else KeySet()
+        self.just_pressed = just_pressed if just_pressed is not None else KeySet()
+        self.upgrade = upgrade  # index into upgrade_buttons to pick while in LEVEL_UP
+
+# ---------------- SIMULATION ----------------
+def step(inputs, dt=None):
+    """Feed dt milliseconds of real time (default: one update's worth at the
+    current sim rate) and run the fixed updates that are due. Never touches the
+    display. Returns the number of updates run."""
+    if dt is None: dt = game_clock.step_ms
+    if game_state==LEVEL_UP and inputs.upgrade is not None and upgrade_buttons:
+        upgrade_buttons[inputs.upgrade % len(upgrade_buttons)].action()
+    game_clock.paused = game_state!=GAME
+    game_clock.advance(dt)
+    ran = 0
+    while game_state==GAME and game_clock.consume():
+        snapshot()
+        t0 = time.perf_counter()
+        update(inputs)
+        director.measure((time.perf_counter()-t0)*1000)
+        inputs.just_pressed = KeySet()  # a key press only counts for one update
+        ran += 1
+    return ran
+
+def snapshot():
+    """Remember where everything was before this update, for interpolation."""
+    player.prev = player.rect.topleft
+    enemy_store.snapshot()
+    for group in (bullets, orbiting_orbs):
+        for ent in group: ent.prev = ent.rect.topleft
+
+def update(inputs):
+    """One fixed simulation step."""
+    global game_state, upgrade_buttons, gun_ready, strength, elapsed, pending_levels
+    player.move(inputs.pressed)
+    elapsed=int(ticks()-start_time)//1000   # whole seconds; game time is a float
+    now=ticks()
+
+    # Spawn what the director asks for, centred on points just off screen
+    for kind, x, y in director.update(now, enemy_counts(), SCREEN.get_rect()):
+        w,h=Enemy.size_of(kind=="boss")
+        if kind=="boss": Boss(x-w//2, y-h//2, strength)
+        else: Enemy.pool.acquire(x-w//2, y-h//2, strength)
+
+    enemy_store.refile(enemy_grid)
+
+    # Auto aim shoot, one bullet at each of the nearest `multishot` enemies
+    if FIRE=="tap": firing=inputs.just_pressed[pygame.K_SPACE]
+    else: firing=gun_ready and (FIRE=="auto" or inputs.pressed[pygame.K_SPACE])
+    if firing and enemies:
+        px,py=player.rect.center
+        for e in enemy_grid.nearest(px,py,player.multishot):
+            dx,dy=e.rect.centerx-px,e.rect.centery-py; d=math.hypot(dx,dy)
+            if d>0: bullets.add(Bullet.pool.acquire(px,py,dx/d,dy/d,player.damage))
+        if FIRE!="tap": gun_ready=False; timers.after(shoot_delay, reload_gun)
+
+    # Bullets (only test enemies in the grid cells the bullet touches)
+    for b in bullets:
+        en = b.move(enemy_grid)
+        if en is None:
+            if not SCREEN.get_rect().colliderect(b.rect): bullets.remove(b)
+            continue
+        en.hp-=b.damage
+        bullets.remove(b)
+        if en.hp<=0: kill(en)
+        elif player.bullet_effect: afflict(en, player.bullet_effect)
+
+    # Orbs
+    for o in orbiting_orbs:
+        o.update()
+        for en in enemy_grid.colliding(o.rect):
+            if not hit(o, en): continue
+            en.hp-=o.damage*STEP
+            if en.hp<=0: kill(en)
+            elif player.orb_effect: afflict(en, player.orb_effect)
+
+    # Everything timed that is due: explosion, reloads, boss summons, status effects
+    timers.advance(now)
+    if laser_beam: laser_beam.update(enemy_grid)
+
+    # Gems: only those inside the magnet ring or under the player are looked at
+    px,py=player.rect.center
+    if player.magnet_radius>0:
+        for g in gem_grid.in_circle(px,py,player.magnet_radius):
+            dx,dy=px-g.rect.centerx,py-g.rect.centery; d=math.hypot(dx,dy)
+            if d>0:
+                g.x+=dx/d*4*STEP; g.y+=dy/d*4*STEP
+                g.rect.topleft=(round(g.x),round(g.y)); gem_grid.move(g,g.rect)
+    for g in gem_grid.colliding(player.rect):
+        gems.remove(g); gem_grid.remove(g)
+        pending_levels+=player.add_xp(g.value)
+    next_level_up()
+
+    # Hearts
+    for h in heart_grid.colliding(player.rect):
+        hearts.remove(h); heart_grid.remove(h); player.heal(1)
+
+    # Enemies move: this update's share re-aim at the player, then the store
+    # steps along its headings in one vectorized pass. Off-screen enemies only
+    # move every few updates (catching up as they do); then boss logic
+    ai.tick()
+    enemy_store.steer(*player.rect.center, ai.rows("steer", enemy_store.n))
+    moving, steps = enemy_store.lod(SCREEN.get_rect(), *player.rect.center, LOD_MARGIN, LOD_FAR)
+    enemy_store.advance(STEP, moving, steps)
+    if SEPARATION: enemy_store.separate(strength=SEPARATION, scale=STEP, rows=moving)
+    ai.run("boss", enemy_store.bosses(), lambda b: b in deaths or b.update(strength))
+    for en in enemy_store.overlapping(player.rect):
+        if en not in deaths and hit(player, en):
+            dead=player.take_damage(en.damage)
+            if not isinstance(en,Boss): kill(en, loot=False)
+            if dead: game_state=GAME_OVER
+
+    resolve_deaths()
+
+    if elapsed//30+1>strength: strength+=1
+
+# ---------------- RENDERING ----------------
+def timer_text():
+    """Time survived as mm:ss, for the HUD."""
+    return f"{elapsed//60:02}:{elapsed%60:02}"
+
+def draw(screen, alpha=1.0):
+    """alpha is how far the clock is between the last update and the next."""
+    screen.blit(BACKGROUND,(0,0)) if BACKGROUND else screen.fill(BLACK)
+    if game_state==MENU:
+        screen.blit(FONT.render(VARIANT["title"],True,WHITE),(SCREEN_WIDTH//2-70,150))
+        start_btn.draw(screen)
+
+    elif game_state==GAME:
+        player.draw(screen, alpha)
+        # XP bar
+        pygame.draw.rect(screen,WHITE,(10,10,200,20),2)
+        pygame.draw.rect(screen,BLUE,(10,10,200*player.xp/player.xp_to_next,20))
+        screen.blit(FONT.render(timer_text(),True,WHITE),(SCREEN_WIDTH//2-40,10))
+        for b in bullets: b.draw(screen, alpha)
+        for o in orbiting_orbs: o.draw(screen, alpha)
+        explosion_spell.draw(screen)
+        if laser_beam: laser_beam.draw(screen)
+        for g in gems: g.draw(screen)
+        for h in hearts: h.draw(screen)
+        for en in enemies: en.draw(screen, alpha)
+        screen.blit(SMALL.render(f"Lvl {player.level}",True,WHITE),(220,10))
+
+    elif game_state==LEVEL_UP:
+        screen.blit(FONT.render("LEVEL UP! Choose:",True,WHITE),(SCREEN_WIDTH//2-150,150))
+        for b in upgrade_buttons: b.draw(screen)
+
+    elif game_state==GAME_OVER:
+        screen.blit(FONT.render("GAME OVER",True,RED),(SCREEN_WIDTH//2-100,200))
+        menu_btn.draw(screen)
+
+# ---------------- SETUP ----------------
+def setup(variant="main"):
+    """Open the window for a variant (a name from variants/, a JSON path or an
+    already loaded dict) and load its images and fonts. Call before run() or
+    start_game(); calling it again switches variant."""
+    global VARIANT, SCREEN_WIDTH, SCREEN_HEIGHT, SCREEN, FONT, SMALL, start_btn, menu_btn
+    global BACKGROUND, PLAYER_IMG, BULLET_IMG, BOSS_IMG, MINION_IMG, XP_GEM_IMG, HEART_IMG, ORB_IMG
+    global FIRE, SHOOT_DELAY, EXPLOSION_DAMAGE_STEP, LIFE_STEAL_STEP, BOSS_ENDS_RUN, BOSS, SEPARATION, LOD_MARGIN, LOD_FAR, director
+    VARIANT = v = variant if isinstance(variant, dict) else load_variant(variant)
+    pygame.init()
+    SCREEN_WIDTH, SCREEN_HEIGHT = v["screen"]
+    SCREEN = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption(v["caption"])
+    BACKGROUND, PLAYER_IMG, BULLET_IMG, BOSS_IMG, MINION_IMG, XP_GEM_IMG, HEART_IMG, ORB_IMG = (
+        assets.image(v["assets"][name], (SCREEN_WIDTH, SCREEN_HEIGHT))
+        for name in ("background", "player", "bullet", "boss", "minion", "xp_gem", "heart", "orb"))
+    FONT, SMALL = assets.font("Arial", 36), assets.font("Arial", 20)
+    assets.warm_rotations(BULLET_IMG)   # bullets fly every which way from the first shot
+    GEM_IMGS[:] = [assets.tinted(XP_GEM_IMG, tint, 1 + 0.2 * tier) for tier, tint in enumerate(GEM_TINTS)]
+    FIRE, SHOOT_DELAY = v["fire"], v["shoot_delay"]
+    ai.buckets, ai.budget_ms = v["ai_buckets"], v["ai_budget_ms"]
+    SEPARATION = v["separation"]
+    LOD_MARGIN, LOD_FAR = v["lod_margin"], v["lod_far"]
+    EXPLOSION_DAMAGE_STEP, LIFE_STEAL_STEP = v["explosion_damage_step"], v["life_steal_step"]
+    BOSS_ENDS_RUN, BOSS = v["boss_ends_run"], v["boss"]
+    director = SpawnDirector(v["spawns"], v["wave_every"], v["enemy_cap"], v["update_budget_ms"], v["spawn_margin"])
+    UPGRADE_POOL[:] = [up for up in UPGRADES if up["name"] in v["upgrades"]]
+    start_btn = Button("Start Game", SCREEN_WIDTH//2-100, SCREEN_HEIGHT//2-40,200,80,RED,GRAY,action=start_game)
+    menu_btn = Button("Main Menu", SCREEN_WIDTH//2-100, SCREEN_HEIGHT//2+40,200,60,RED,GRAY,action=back_to_menu)
+    return v
+
+# ---------------- MAIN LOOP ----------------
+def run():
+    frame_clock = pygame.time.Clock()
+    running = True
+    dt = 0
+    presses = set()  # held over until an update has seen them
+    while running:
+        for event in pygame.event.get():
+            if event.type==pygame.QUIT: running=False
+            if event.type==pygame.KEYDOWN: presses.add(event.key)
+            if event.type==pygame.KEYDOWN and event.key==pygame.K_F2: print("\n".join(memory_report()))
+            if game_state==MENU: start_btn.click(event)
+            elif game_state==LEVEL_UP: [b.click(event) for b in upgrade_buttons]
+            elif game_state==GAME_OVER: menu_btn.click(event)
+
+        if step(Inputs(pygame.key.get_pressed(), KeySet(presses)), dt) or game_state!=GAME:
+            presses.clear()
+        draw(SCREEN, game_clock.alpha)
+        pygame.display.flip()
+        dt = frame_clock.tick(DISPLAY_FPS)
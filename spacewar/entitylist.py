@@ -0,0 +1,107 @@
+# ---------------- ENTITY LIST ----------------
+class Entity:
+    """Base for slotted entity classes: reserves the attributes that EntityList
+    (`index`, `handle`) and Pool (`pooled`) set on the things they manage."""
+    __slots__ = ("index", "handle", "pooled")
+
+class EntityList:
+    """Dense list of entities with O(1) removal and generational handles.
+
+    remove() moves the last entity into the freed slot, so order is not kept.
+    Removing while the list is being looped over only marks the entity: it is
+    skipped for the rest of the loop and dropped when the outermost loop ends,
+    so game loops can remove freely without iterating over a copy.
+
+    add() returns a handle, (slot, generation). get(handle) gives the entity
+    back while it is alive and None once it has been removed, even after its
+    slot has been handed to a newer entity, so a handle is a safe long-lived
+    reference (a timer or status effect on a pooled enemy). Entities get two
+    attributes: `index` (position in `items`) and `handle`.
+
+    Entities whose class has a `pool` (see pool.py) are released to it once
+    they are actually dropped from the list.
+    """
+    def __init__(self):
+        self.items = []
+        self._gens = []      # handle slot -> generation of its current owner
+        self._owners = []    # handle slot -> entity, or None when free
+        self._free = []
+        self._doomed = {}    # entities removed during a loop, dropped when it ends
+        self._depth = 0      # how many loops over the list are running
+
+    def __len__(self):
+        return len(self.items) - len(self._doomed)
+
+    def __iter__(self):
+        self._depth += 1
+        try:
+            items, doomed = self.items, self._doomed
+            for i in range(len(items)):   # entities added during the loop are not visited
+                ent = items[i]
+                if not doomed or ent not in doomed:
+                    yield ent
+        finally:
+            self._depth -= 1
+            if not self._depth and self._doomed:
+                self._flush()
+
+    def __contains__(self, ent):
+        i = getattr(ent, "index", None)
+        return i is not None and i < len(self.items) and self.items[i] is ent and ent not in self._doomed
+
+    def add(self, ent):
+        if self._free:
+            slot = self._free.pop()
+            self._owners[slot] = ent
+        else:
+            slot = len(self._gens)
+            self._gens.append(0)
+            self._owners.append(ent)
+        ent.handle = (slot, self._gens[slot])
+        ent.index = len(self.items)
+        self.items.append(ent)
+        return ent.handle
+
+    def get(self, handle):
+        if handle is None:
+            return None
+        slot, gen = handle
+        return self._owners[slot] if self._gens[slot] == gen else None
+
+    def remove(self, ent):
+        """Remove ent; removing something that is not in the list is harmless."""
+        if ent not in self:
+            return
+        slot = ent.handle[0]
+        self._gens[slot] += 1
+        self._owners[slot] = None
+        self._free.append(slot)
+        if self._depth:
+            self._doomed[ent] = None
+        else:
+            self._pop(ent)
+
+    def clear(self):
+        for ent in list(self):
+            self.remove(ent)
+
+    def _flush(self):
+        # Pop from the back so swaps never move a doomed entity into a checked slot
+        for ent in sorted(self._doomed, key=lambda e: e.index, reverse=True):
+            self._pop(ent)
+        self._doomed.clear()
+
+    def _pop(self, ent):
+        i, last = ent.index, len(self.items) - 1
+        if i != last:
+            self._move(last, i)
+        self.items.pop()
+        ent.index = None
+        pool = getattr(ent, "pool", None)
+        if pool is not None:
+            pool.release(ent)
+
+    def _move(self, src, dst):
+        moved = self.items[src]
+        self.items[dst] = moved
+        moved.index = dst
@@ -0,0 +1,64 @@
+class GameClock:
+    """Fixed-timestep game clock.
+
+    Real frame time goes in through advance(); the simulation then runs one
+    update per consume() that returns True, each worth exactly step_ms of game
+    time. Speeds in the game are therefore "pixels per step" no matter what the
+    display frame rate is. Game time does not move while paused.
+    """
+    def __init__(self, step_ms=1000/60, max_steps=5, time_scale=1.0):
+        self.step_ms = step_ms
+        self.max_steps = max_steps    # catch-up limit per advance(); None for no limit
+        self.time_scale = time_scale
+        self.paused = False
+        self.time = 0.0               # game time in ms
+        self.accumulator = 0.0
+        self.steps = 0                # total steps consumed
+        self.dropped_ms = 0.0         # time thrown away by the catch-up limit
+        self._budget = 0
+        self._base = (0.0, 0, step_ms)   # (time, steps, step_ms) when step_ms last changed
+
+    def now(self):
+        return self.time
+
+    def pause(self):
+        self.paused = True
+
+    def resume(self):
+        self.paused = False
+
+    def advance(self, real_ms):
+        """Feed real elapsed time. Returns how many steps are now due."""
+        if self.paused:
+            self._budget = 0
+            return 0
+        self.accumulator += real_ms * self.time_scale
+        due = int(self.accumulator // self.step_ms)
+        if self.max_steps is not None and due > self.max_steps:
+            # Too far behind (hitch, debugger, slow machine): drop the backlog
+            # instead of spiralling into ever longer frames.
+            self.dropped_ms += (due - self.max_steps) * self.step_ms
+            self.accumulator -= (due - self.max_steps) * self.step_ms
+            due = self.max_steps
+        self._budget = due
+        return due
+
+    def consume(self):
+        """Take one due step, advancing game time. False when none are left or paused."""
+        if self.paused or self._budget <= 0:
+            return False
+        self._budget -= 1
+        self.accumulator -= self.step_ms
+        self.steps += 1
+        # Counted in whole steps rather than summed, so a step of 1000/60 ms
+        # does not drift (720 steps are 12000 ms, not 11999.99...)
+        time, steps, step_ms = self._base
+        if step_ms != self.step_ms:
+            time, steps, step_ms = self._base = (self.time, self.steps - 1, self.step_ms)
+        self.time = time + (self.steps - steps) * step_ms
+        return True
+
+    @property
+    def alpha(self):
+        """Fraction of a step left in the accumulator, in [0, 1)."""
+        return min(1.0, self.accumulator / self.step_ms)
@@ -0,0 +1,67 @@
+import math
+import pygame
+
+# Pixel masks for sprite collisions. Building a mask walks every pixel, so each
+# scaled asset gets its mask built once and reused by every entity that draws
+# it. Rotated sprites keep their mask next to the sprite in assets.rotated()'s
+# cache (see assets.rotated_mask()).
+
+ROTATION_STEPS = 64
+
+_masks = {}      # id(surface) -> (surface, mask); the surface is kept so the id stays unique
+_solid = {}      # size -> fully set mask, for entities drawn as plain rects
+
+def mask_of(surface):
+    if surface is None:
+        return None
+    cached = _masks.get(id(surface))
+    if cached is None:
+        cached = _masks[id(surface)] = (surface, pygame.mask.from_surface(surface))
+    return cached[1]
+
+def rotation_step(angle, steps=ROTATION_STEPS):
+    """Which of `steps` evenly spaced rotations angle degrees snaps to."""
+    return round(angle * steps / 360) % steps
+
+def solid_mask(size):
+    mask = _solid.get(size)
+    if mask is None:
+        mask = _solid[size] = pygame.mask.Mask(size, fill=True)
+    return mask
+
+def cache_size():
+    return len(_masks) + len(_solid)
+
+def hit(a, b):
+    """Do two entities touch? Cheap Rect test first; only if the rects overlap
+    are their masks (centered on their rects) compared pixel by pixel. An
+    entity without a mask counts as its full rect."""
+    if not a.rect.colliderect(b.rect):
+        return False
+    ma, mb = a.mask, b.mask
+    if ma is None and mb is None:
+        return True
+    return _overlap(a, b, 0, 0)
+
+def _overlap(a, b, ox, oy):
+    """Pixel overlap with a shifted by (ox, oy)."""
+    ma = a.mask if a.mask is not None else solid_mask(a.rect.size)
+    mb = b.mask if b.mask is not None else solid_mask(b.rect.size)
+    (aw, ah), (bw, bh) = ma.get_size(), mb.get_size()
+    ax, ay = a.rect.centerx + ox - aw // 2, a.rect.centery + oy - ah // 2
+    bx, by = b.rect.centerx - bw // 2, b.rect.centery - bh // 2
+    return ma.overlap(mb, (bx - ax, by - ay)) is not None
+
+def hit_along(a, b, dx, dy, t0, t1):
+    """Pixel test for a moving by (dx, dy) from its current rect against b,
+    over the part [t0, t1] of the move where their rects overlap (from
+    SpatialHashGrid.sweep). Samples about every 2 px. Returns the first t where
+    the masks touch, or None."""
+    if a.mask is None and b.mask is None:
+        return t0
+    n = max(1, int(math.hypot(dx, dy) * (t1 - t0) / 2))
+    for i in range(n + 1):
+        t = t0 + (t1 - t0) * i / n
+        if _overlap(a, b, round(dx * t), round(dy * t)):
+            return t
+    return None
@@ -0,0 +1,89 @@
+import sys
+import time
+import tracemalloc
+
+import pygame
+
+# ---------------- MEMORY REPORT ----------------
+# Bytes per entity type, counted as what each instance owns: the object itself,
+# its __dict__ if it has one, and the Rects and containers stored on it.
+# Surfaces and masks are shared assets and not charged to any one entity.
+OWNED = (pygame.Rect, list, dict, tuple, set)
+
+def instance_bytes(obj):
+    size = sys.getsizeof(obj)
+    attrs = getattr(obj, "__dict__", None)
+    if attrs is not None:
+        size += sys.getsizeof(attrs)
+        values = list(attrs.values())
+    else:
+        values = []
+    for cls in type(obj).__mro__:
+        for name in getattr(cls, "__slots__", ()):
+            value = getattr(obj, name, None)
+            if value is not None:
+                values.append(value)
+    return size + sum(sys.getsizeof(v) for v in values if isinstance(v, OWNED))
+
+def entity_table(groups):
+    """groups: {name: iterable of instances} -> [(name, count, bytes)]."""
+    rows = []
+    for name, objs in groups.items():
+        objs = list(objs)
+        rows.append((name, len(objs), sum(instance_bytes(o) for o in objs)))
+    return rows
+
+class MemoryWatch:
+    """tracemalloc-based growth check. start() takes a baseline; check() reports
+    how much traced memory has grown since then, the rate per hour of play
+    against an optional budget, and the source lines that grew most.
+
+    `clock` returns milliseconds of play; pass the game clock so a headless run
+    going faster than real time still reports per hour of game time.
+    """
+    def __init__(self, budget_mb_per_hour=None, clock=None, frames=1):
+        self.budget = budget_mb_per_hour
+        self.clock = clock or (lambda: time.perf_counter() * 1000)
+        self.frames = frames
+        self.baseline = None
+        self.started = None
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+        self.baseline = tracemalloc.take_snapshot()
+        self.started = self.clock()
+
+    def check(self, top=5):
+        if self.baseline is None:
+            self.start()
+            return ["tracemalloc started; growth is reported from the next check on"]
+        snap = tracemalloc.take_snapshot()
+        diff = snap.compare_to(self.baseline, "lineno")
+        grown = sum(d.size_diff for d in diff)
+        hours = (self.clock() - self.started) / 3_600_000
+        lines = [f"traced growth {grown / 1024:+.1f} KiB since start"]
+        if hours > 0:
+            rate = grown / 2**20 / hours
+            line = f"  = {rate:+.2f} MiB per hour of play"
+            if self.budget is not None:
+                line += f" (budget {self.budget:g}: {'OVER' if rate > self.budget else 'ok'})"
+            lines.append(line)
+        for d in diff[:top]:
+            if d.size_diff:
+                frame = d.traceback[0]
+                lines.append(f"  {d.size_diff / 1024:+9.1f} KiB  {frame.filename}:{frame.lineno}")
+        return lines
+
+def format_report(rows, extra=(), watch_lines=()):
+    """Table of entity rows plus (label, bytes) extras, then the tracemalloc lines."""
+    lines = [f"{'type':<12}{'count':>8}{'bytes':>12}{'per':>8}"]
+    total = 0
+    for name, count, size in rows:
+        lines.append(f"{name:<12}{count:>8}{size:>12}{size // count if count else 0:>8}")
+        total += size
+    for label, size in extra:
+        lines.append(f"{label:<20}{size:>12}")
+        total += size
+    lines.append(f"{'total':<20}{total:>12}")
+    return lines + list(watch_lines)
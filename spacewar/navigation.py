@@ -0,0 +1,154 @@
+import heapq
+from collections import OrderedDict
+import numpy as np
+
+# ---------------- FLOW FIELD ----------------
+# (d_col, d_row, cost): straight steps cost 10, diagonals 14 (~10 * sqrt 2)
+STEPS = ((1, 0, 10), (-1, 0, 10), (0, 1, 10), (0, -1, 10),
+         (1, 1, 14), (1, -1, 14), (-1, 1, 14), (-1, -1, 14))
+UNREACHABLE = np.iinfo(np.int32).max
+
+class FlowField:
+    """Directions from every tile of a tile map toward one goal tile.
+
+    `passable` is a 2D bool array indexed [row, col]. set_goal() runs one
+    Dijkstra from the goal over the open tiles and stores, per tile, the unit
+    step toward its cheapest neighbour. Agents then only look up the tile
+    they stand on, so pathing costs the same for 5 enemies or 500. Diagonal
+    steps never cut the corner of a closed tile.
+
+    The field changes only when the goal enters another tile, and then it is
+    repaired from the current one rather than built from scratch: moving the
+    goal from g to g' can make a tile at most cost(g') more expensive, so the
+    old costs plus cost(g') are upper bounds, and a Dijkstra from g' only has
+    to visit the tiles that got cheaper (on open maps with diagonal moves
+    that is still most of them). Fields for the last `cache` goal tiles are
+    kept as well, so a player pacing between a few tiles costs nothing. Tiles closed off from the
+    goal, and tiles outside the map, get no direction (0, 0); closed tiles
+    point at their cheapest open neighbour so agents pushed into a wall find
+    their way out.
+    """
+    def __init__(self, passable, tile_size, cache=16):
+        self.passable = np.array(passable, dtype=bool)
+        self.rows, self.cols = self.passable.shape
+        self.tile_size = tile_size
+        self.cache = cache
+        self.goal = None          # (col, row)
+        self.cost = None          # [row, col] path cost to the goal, UNREACHABLE if none
+        self.flow = None          # [row, col] -> unit (dx, dy)
+        self.builds = 0           # fields built from scratch
+        self.repairs = 0          # fields repaired from the previous goal's
+        self._fields = OrderedDict()   # goal -> (cost, flow), oldest first
+        self._adj = None
+
+    def tile_of(self, x, y):
+        return int(x // self.tile_size), int(y // self.tile_size)
+
+    def set_goal(self, x, y):
+        """Aim the field at the tile holding pixel (x, y), clamped to the map.
+        Returns True if the field had to be computed (built or repaired)."""
+        col, row = self.tile_of(x, y)
+        goal = (min(max(col, 0), self.cols - 1), min(max(row, 0), self.rows - 1))
+        if goal == self.goal:
+            return False
+        # A closed goal tile is left but never entered, so its costs are no bounds for others
+        previous = self.cost if self.goal is not None and self.passable[self.goal[1], self.goal[0]] else None
+        self.goal = goal
+        field = self._fields.pop(goal, None)
+        built = field is None
+        if built:
+            field = self._build(goal, previous)
+        self._fields[goal] = field
+        while len(self._fields) > self.cache:
+            self._fields.popitem(last=False)
+        self.cost, self.flow = field
+        return built
+
+    def set_passable(self, col, row, passable=True):
+        """Open or close one tile. Cached fields are dropped and the current
+        one is rebuilt."""
+        self.passable[row, col] = passable
+        self._fields.clear()
+        self._adj = None
+        goal, self.goal, self.cost, self.flow = self.goal, None, None, None
+        if goal is not None:
+            self.set_goal((goal[0] + 0.5) * self.tile_size, (goal[1] + 0.5) * self.tile_size)
+
+    def directions(self, pos):
+        """(n, 2) unit directions for (n, 2) pixel positions."""
+        pos = np.asarray(pos, dtype=np.float64).reshape(-1, 2)
+        out = np.zeros((len(pos), 2))
+        if self.flow is None:
+            return out
+        t = np.floor(pos / self.tile_size).astype(np.int64)
+        inside = (t[:, 0] >= 0) & (t[:, 0] < self.cols) & (t[:, 1] >= 0) & (t[:, 1] < self.rows)
+        out[inside] = self.flow[t[inside, 1], t[inside, 0]]
+        return out
+
+    def _edges(self):
+        """Per flat tile index (row * cols + col), its open (neighbour, cost)
+        steps; built once per passability change."""
+        if self._adj is None:
+            passable, cols, rows = self.passable, self.cols, self.rows
+            adj = []
+            for row in range(rows):
+                for col in range(cols):
+                    out = []
+                    for dc, dr, cost in STEPS:
+                        c, r = col + dc, row + dr
+                        if not (0 <= c < cols and 0 <= r < rows) or not passable[r, c]:
+                            continue
+                        if dc and dr and not (passable[row, c] and passable[r, col]):
+                            continue
+                        out.append((r * cols + c, cost))
+                    adj.append(out)
+            self._adj = adj
+        return self._adj
+
+    def _build(self, goal, previous=None):
+        col, row = goal
+        if previous is not None and previous[row, col] < UNREACHABLE:
+            # Upper bounds from the previous field; only tiles that get cheaper are visited
+            cost = np.where(previous < UNREACHABLE, previous + previous[row, col], UNREACHABLE).ravel().tolist()
+            self.repairs += 1
+        else:
+            cost = [UNREACHABLE] * (self.rows * self.cols)
+            self.builds += 1
+        adj = self._edges()
+        start = row * self.cols + col
+        cost[start] = 0
+        heap = [(0, start)]
+        pop, push = heapq.heappop, heapq.heappush
+        while heap:
+            d, i = pop(heap)
+            if d > cost[i]:
+                continue
+            for j, step in adj[i]:
+                nd = d + step
+                if nd < cost[j]:
+                    cost[j] = nd
+                    push(heap, (nd, j))
+        cost = np.array(cost, np.int64).reshape(self.rows, self.cols)
+        return cost, self._flow(cost, goal)
+
+    def _flow(self, cost, goal):
+        """Per tile, the unit step to the neighbour with the lowest cost plus
+        step cost, computed for the whole grid one direction at a time."""
+        rows, cols = cost.shape
+        wide = np.full((rows + 2, cols + 2), UNREACHABLE, np.int64)
+        wide[1:-1, 1:-1] = cost
+        open_ = np.zeros((rows + 2, cols + 2), bool)
+        open_[1:-1, 1:-1] = self.passable
+        best = np.full((rows, cols), UNREACHABLE, np.int64)
+        flow = np.zeros((rows, cols, 2))
+        for dc, dr, step in STEPS:
+            via = wide[1 + dr:rows + 1 + dr, 1 + dc:cols + 1 + dc]
+            ok = via < UNREACHABLE
+            if dc and dr:   # no corner cutting
+                ok &= open_[1:-1, 1 + dc:cols + 1 + dc] & open_[1 + dr:rows + 1 + dr, 1:-1]
+            total = np.where(ok, via + step, UNREACHABLE)
+            better = total < best
+            best[better] = total[better]
+            flow[better] = (dc / np.hypot(dc, dr), dr / np.hypot(dc, dr))
+        flow[goal[1], goal[0]] = 0   # agents on the goal tile head for the goal itself
+        return flow
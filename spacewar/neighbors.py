@@ -0,0 +1,34 @@
+import numpy as np
+
+# ---------------- GRID NEIGHBOR JOIN ----------------
+# Candidate pairs between two point sets, found by binning both into a uniform
+# grid and matching each point of `a` with the points of `b` in its own and the
+# 8 surrounding cells. Binning and matching are sorts and binary searches over
+# whole arrays, so the cost grows with the number of points and of close pairs,
+# never with all pairs.
+CELL_KEY = 1 << 32  # grid cell (cx, cy) is packed into cx * CELL_KEY + cy
+
+def grid_pairs(pa, pb, cell):
+    """(ia, ib) index arrays of every pa/pb pair in neighbouring cells of size
+    `cell`. Pairs closer than `cell` are all included; farther ones may be."""
+    if not len(pa) or not len(pb):
+        return np.zeros(0, np.int64), np.zeros(0, np.int64)
+    ca, cb = np.floor(pa / cell).astype(np.int64), np.floor(pb / cell).astype(np.int64)
+    key_b = cb[:, 0] * CELL_KEY + cb[:, 1]
+    order = np.argsort(key_b, kind="stable")
+    sorted_b = key_b[order]
+    ia, ib = [], []
+    for ox in (-1, 0, 1):
+        for oy in (-1, 0, 1):
+            key = (ca[:, 0] + ox) * CELL_KEY + ca[:, 1] + oy
+            lo = np.searchsorted(sorted_b, key, "left")
+            counts = np.searchsorted(sorted_b, key, "right") - lo
+            total = int(counts.sum())
+            if not total:
+                continue
+            ends = np.cumsum(counts)
+            ia.append(np.repeat(np.arange(len(pa)), counts))
+            ib.append(order[np.repeat(lo, counts) + np.arange(total) - np.repeat(ends - counts, counts)])
+    if not ia:
+        return np.zeros(0, np.int64), np.zeros(0, np.int64)
+    return np.concatenate(ia), np.concatenate(ib)
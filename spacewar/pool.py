@@ -0,0 +1,60 @@
+# ---------------- OBJECT POOLS ----------------
+# Short-lived entities (bullets, gems, hearts, minions) are recycled instead of
+# rebuilt, so a busy fight does not churn through Rects and rotated surfaces
+# and feed the garbage collector.
+
+POOLS = []    # every pool, for pool_report()
+
+class Pool:
+    """Free list for one entity class.
+
+    The class does its one-time setup in __init__ and puts everything that
+    depends on the spawn arguments in reset(), which __init__ also calls;
+    acquire() hands back a released object reset with the new arguments, or a
+    fresh one when the free list is empty. Give the class a `pool` attribute
+    and EntityList releases its entities back here when they leave the list.
+    """
+    def __init__(self, cls, name=None):
+        self.cls = cls
+        self.name = name or cls.__name__
+        self.free = []
+        self.live = 0       # acquired and not yet released
+        self.peak = 0       # most ever live at once
+        self.created = 0    # objects built because the free list was empty
+        self.reused = 0
+        POOLS.append(self)
+
+    def acquire(self, *args, **kwargs):
+        if self.free:
+            obj = self.free.pop()
+            obj.reset(*args, **kwargs)
+            self.reused += 1
+        else:
+            obj = self.cls(*args, **kwargs)
+            self.created += 1
+        obj.pooled = False
+        self.live += 1
+        self.peak = max(self.peak, self.live)
+        return obj
+
+    def release(self, obj):
+        """Take obj back. Releasing twice, or releasing something that was not
+        acquired from a pool, is harmless."""
+        if getattr(obj, "pooled", True):
+            return
+        obj.pooled = True
+        self.live -= 1
+        self.free.append(obj)
+
+    def stats(self):
+        return {"live": self.live, "free": len(self.free), "peak": self.peak,
+                "created": self.created, "reused": self.reused}
+
+def pool_report():
+    """One line per pool: live / free / peak counts and reuse ratio."""
+    lines = []
+    for p in POOLS:
+        total = p.created + p.reused
+        lines.append(f"{p.name:<8} live {p.live:>5}  free {len(p.free):>5}  peak {p.peak:>5}  "
+                     f"created {p.created:>6}  reused {p.reused:>7} ({p.reused / total if total else 0:.0%})")
+    return lines
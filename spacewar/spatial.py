@@ -0,0 +1,277 @@
+import heapq
+
+INF = float("inf")
+
+def segment_rect_clip(x0, y0, x1, y1, rect):
+    """(t_enter, t_exit) fractions along the segment while it is inside rect, or
+    None if it misses. Liang-Barsky clipping; a segment starting inside rect
+    enters at t=0."""
+    t0, t1 = 0.0, 1.0
+    dx, dy = x1 - x0, y1 - y0
+    for p, q in ((-dx, x0 - rect.left), (dx, rect.right - x0), (-dy, y0 - rect.top), (dy, rect.bottom - y0)):
+        if p == 0:
+            if q < 0:
+                return None
+        else:
+            t = q / p
+            if p < 0:
+                if t > t1:
+                    return None
+                if t > t0:
+                    t0 = t
+            else:
+                if t < t0:
+                    return None
+                if t < t1:
+                    t1 = t
+    return t0, t1
+
+def segment_rect_entry(x0, y0, x1, y1, rect):
+    """Fraction t in [0, 1] along the segment where it first touches rect, or None."""
+    clip = segment_rect_clip(x0, y0, x1, y1, rect)
+    return clip[0] if clip else None
+
+# ---------------- SPATIAL HASH GRID ----------------
+class SpatialHashGrid:
+    """Uniform grid over the world, keyed by cell coordinate.
+
+    Items are any hashable objects; each is filed under every cell its rect
+    touches. query() returns the items sharing a cell with the given rect
+    (a broadphase: callers still do their own exact overlap test).
+    """
+    def __init__(self, cell_size=64):
+        self.cell_size = cell_size
+        self.cells = {}    # (cx, cy) -> {item: None}, dicts keep insertion order
+        self.spans = {}    # item -> (x0, y0, x1, y1) cell range it is filed under
+
+    def __len__(self):
+        return len(self.spans)
+
+    def __contains__(self, item):
+        return item in self.spans
+
+    def _span(self, rect):
+        cs = self.cell_size
+        return (rect.left // cs, rect.top // cs, (rect.right - 1) // cs, (rect.bottom - 1) // cs)
+
+    def _add(self, item, span):
+        x0, y0, x1, y1 = span
+        cells = self.cells
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                cell = cells.get((cx, cy))
+                if cell is None:
+                    cells[(cx, cy)] = {item: None}
+                else:
+                    cell[item] = None
+
+    def _discard(self, item, span):
+        x0, y0, x1, y1 = span
+        cells = self.cells
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                cell = cells[(cx, cy)]
+                del cell[item]
+                if not cell:
+                    del cells[(cx, cy)]
+
+    def insert(self, item, rect):
+        span = self._span(rect)
+        self.spans[item] = span
+        self._add(item, span)
+
+    def remove(self, item):
+        span = self.spans.pop(item, None)
+        if span is not None:
+            self._discard(item, span)
+
+    def move(self, item, rect):
+        """Refile item after its rect changed. Cheap when it stays in the same cells."""
+        span = self._span(rect)
+        old = self.spans.get(item)
+        if old == span:
+            return
+        if old is not None:
+            self._discard(item, old)
+        self.spans[item] = span
+        self._add(item, span)
+
+    def clear(self):
+        self.cells.clear()
+        self.spans.clear()
+
+    def rebuild(self, items):
+        """Refile every item from scratch using item.rect."""
+        self.clear()
+        for item in items:
+            self.insert(item, item.rect)
+
+    def query(self, rect):
+        """Items filed in any cell that rect touches, each once, in a stable order."""
+        x0, y0, x1, y1 = self._span(rect)
+        cells = self.cells
+        if x0 == x1 and y0 == y1:
+            cell = cells.get((x0, y0))
+            return list(cell) if cell else []
+        found = {}
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                cell = cells.get((cx, cy))
+                if cell:
+                    found.update(cell)
+        return list(found)
+
+    def colliding(self, rect):
+        """Items whose own rect overlaps rect."""
+        return [item for item in self.query(rect) if rect.colliderect(item.rect)]
+
+    def sweep(self, rect, dx, dy):
+        """Swept AABB: items that rect touches while moving by (dx, dy), as
+        (t_enter, t_exit, item) sorted by t_enter, with t as a fraction of the move.
+
+        Each item's rect is grown by the mover's size (Minkowski sum) and
+        clipped against the path of the mover's center, so nothing is tunnelled
+        through however long the move is.
+        """
+        cx, cy = rect.center
+        hits = []
+        for item in self.query(rect.union(rect.move(dx, dy))):
+            clip = segment_rect_clip(cx, cy, cx + dx, cy + dy, item.rect.inflate(rect.w, rect.h))
+            if clip:
+                hits.append((clip[0], clip[1], item))
+        hits.sort(key=lambda h: h[0])
+        return hits
+
+    def in_annulus(self, x, y, r0, r1):
+        """Items whose rect center lies at a distance in [r0, r1] from (x, y).
+
+        Only cells that can hold such a center are visited, so the cost follows
+        the area of the ring rather than the number of items in the grid.
+        """
+        cs = self.cell_size
+        cells = self.cells
+        r0sq, r1sq = r0 * r0, r1 * r1
+        found = {}
+        for cx in range(int(x - r1) // cs, int(x + r1) // cs + 1):
+            left, right = cx * cs, cx * cs + cs
+            ndx = left - x if x < left else (x - right if x > right else 0)
+            fdx = max(x - left, right - x)
+            for cy in range(int(y - r1) // cs, int(y + r1) // cs + 1):
+                cell = cells.get((cx, cy))
+                if not cell:
+                    continue
+                top, bottom = cy * cs, cy * cs + cs
+                ndy = top - y if y < top else (y - bottom if y > bottom else 0)
+                fdy = max(y - top, bottom - y)
+                if ndx * ndx + ndy * ndy > r1sq or fdx * fdx + fdy * fdy < r0sq:
+                    continue
+                for item in cell:
+                    if item in found:
+                        continue
+                    cx_, cy_ = item.rect.center
+                    d = (cx_ - x) ** 2 + (cy_ - y) ** 2
+                    if r0sq <= d <= r1sq:
+                        found[item] = None
+        return list(found)
+
+    def in_circle(self, x, y, r):
+        """Items whose rect center lies within r of (x, y)."""
+        return self.in_annulus(x, y, 0, r)
+
+    def nearest(self, x, y, k=1, max_dist=None):
+        """Up to k items whose rect centers are closest to (x, y), closest first.
+
+        Searches rings of cells outward from (x, y) and stops once no unvisited
+        cell can hold anything closer than the k-th best found so far.
+        """
+        cs = self.cell_size
+        cells = self.cells
+        limit = float("inf") if max_dist is None else max_dist * max_dist
+        best = {}    # item -> squared distance
+        ox, oy = int(x) // cs, int(y) // cs
+        r = 0
+        while True:
+            if (2 * r + 1) ** 2 > len(cells):
+                # The ring would cover more cells than are occupied: just scan those.
+                ring = list(cells.values())
+                done = True
+            else:
+                ring = [cells[c] for c in self._ring(ox, oy, r) if c in cells]
+                done = False
+            for cell in ring:
+                for item in cell:
+                    if item not in best:
+                        cx, cy = item.rect.center
+                        best[item] = (cx - x) ** 2 + (cy - y) ** 2
+            if done or len(best) == len(self.spans):
+                break
+            # Anything not seen yet has its center outside the visited square.
+            edge = min(x - (ox - r) * cs, (ox + r + 1) * cs - x, y - (oy - r) * cs, (oy + r + 1) * cs - y)
+            edge *= edge
+            if edge > limit:
+                break
+            if len(best) >= k and heapq.nsmallest(k, best.values())[-1] <= edge:
+                break
+            r += 1
+        return [item for item in heapq.nsmallest(k, best, key=best.get) if best[item] <= limit]
+
+    def nearest_within(self, x, y, radius):
+        """The single closest item within radius of (x, y), or None."""
+        found = self.nearest(x, y, 1, radius)
+        return found[0] if found else None
+
+    @staticmethod
+    def _ring(ox, oy, r):
+        if r == 0:
+            yield ox, oy
+            return
+        for cx in range(ox - r, ox + r + 1):
+            yield cx, oy - r
+            yield cx, oy + r
+        for cy in range(oy - r + 1, oy + r):
+            yield ox - r, cy
+            yield ox + r, cy
+
+    def raycast(self, x0, y0, x1, y1, limit=None):
+        """Items whose rect the segment (x0, y0)-(x1, y1) crosses, as (t, item)
+        pairs ordered along it, at most `limit` of them.
+
+        Walks only the cells under the segment (DDA / Amanatides-Woo) and stops
+        early once `limit` hits are known to come before every unvisited cell.
+        """
+        cs = self.cell_size
+        cells = self.cells
+        dx, dy = x1 - x0, y1 - y0
+        cx, cy = int(x0 // cs), int(y0 // cs)
+        step_x, step_y = (1 if dx > 0 else -1), (1 if dy > 0 else -1)
+        if dx:
+            t_max_x = (((cx + 1) * cs - x0) if dx > 0 else (x0 - cx * cs)) / abs(dx)
+            t_delta_x = cs / abs(dx)
+        else:
+            t_max_x = t_delta_x = INF
+        if dy:
+            t_max_y = (((cy + 1) * cs - y0) if dy > 0 else (y0 - cy * cs)) / abs(dy)
+            t_delta_y = cs / abs(dy)
+        else:
+            t_max_y = t_delta_y = INF
+        seen = {}    # item -> entry t, or None for a miss
+        while True:
+            cell = cells.get((cx, cy))
+            if cell:
+                for item in cell:
+                    if item not in seen:
+                        seen[item] = segment_rect_entry(x0, y0, x1, y1, item.rect)
+            t_exit = min(t_max_x, t_max_y)
+            if t_exit >= 1:
+                break
+            if limit is not None and sum(1 for t in seen.values() if t is not None and t <= t_exit) >= limit:
+                break
+            if t_max_x < t_max_y:
+                cx += step_x
+                t_max_x += t_delta_x
+            else:
+                cy += step_y
+                t_max_y += t_delta_y
+        hits = sorted(((t, i) for i, t in enumerate(seen.values()) if t is not None))
+        items = list(seen)
+        return [(t, items[i]) for t, i in hits[:limit]]
@@ -0,0 +1,117 @@
+import math
+
+# ---------------- TIMER WHEEL ----------------
+class Timer:
+    """A scheduled callback; keep it to cancel() it."""
+    __slots__ = ("at", "callback", "args", "period", "times", "cancelled")
+
+    def __init__(self, at, callback, args, period=None, times=None):
+        self.at = at                  # tick it fires on
+        self.callback = callback
+        self.args = args
+        self.period = period          # ticks between repeats, None for one-shot
+        self.times = times            # repeats left, None for no limit
+        self.cancelled = False
+
+    def cancel(self):
+        """O(1): the timer stays in its slot and is dropped when the slot is reached."""
+        self.cancelled = True
+
+class TimerWheel:
+    """Hierarchical timing wheel that owns the game's timed events.
+
+    Time is cut into ticks of `tick_ms`. Level 0 has one slot per tick for the
+    next `slots` ticks; each level above covers `slots` times the span of the
+    one below with slots as wide as that whole level. A timer goes into the
+    lowest level whose span reaches its due tick and, as the wheel turns, is
+    moved down a level each time its slot comes round (at most `levels - 1`
+    moves), so scheduling, cancelling and firing are all O(1) per timer, and an
+    update only looks at the one level-0 slot that is due instead of polling
+    every cooldown in the game. Timers further out than the top level can reach
+    wait in its last slot and are re-filed when it comes round.
+
+    All times are in the same ms as `now` given to advance(); callbacks run
+    from inside advance(), in due order, and may schedule or cancel timers.
+    """
+    def __init__(self, tick_ms=10, slots=64, levels=4):
+        assert slots & (slots - 1) == 0, "slots must be a power of two"
+        self.tick_ms = tick_ms
+        self.slots = slots
+        self.levels = levels
+        self.bits = slots.bit_length() - 1
+        self.fired = 0
+        self.cascaded = 0             # timers moved down a level
+        self.reset(0)
+
+    def reset(self, now):
+        """Drop every timer and restart the wheel at game time `now`."""
+        self.wheel = [[[] for _ in range(self.slots)] for _ in range(self.levels)]
+        self.tick = self._tick_of(now)    # next tick to process
+
+    def _tick_of(self, ms):
+        return math.floor(ms / self.tick_ms + 1e-9)
+
+    def after(self, delay_ms, callback, *args):
+        """Run callback(*args) once, delay_ms from the current time."""
+        return self._add(Timer(self.tick + self._ticks(delay_ms), callback, args))
+
+    def every(self, period_ms, callback, *args, times=None):
+        """Run callback(*args) every period_ms, first one period from now;
+        `times` limits the number of runs."""
+        period = max(1, self._ticks(period_ms))
+        return self._add(Timer(self.tick + period, callback, args, period, times))
+
+    def _ticks(self, ms):
+        return max(0, math.ceil(ms / self.tick_ms - 1e-9))
+
+    def _add(self, timer):
+        delta = timer.at - self.tick
+        if delta < 0:
+            delta = 0
+        span = self.slots
+        for level in range(self.levels):
+            if delta < span or level == self.levels - 1:
+                at = max(timer.at, self.tick) if delta < span else self.tick + span - 1
+                self.wheel[level][(at >> (self.bits * level)) & (self.slots - 1)].append(timer)
+                return timer
+            span <<= self.bits
+
+    def advance(self, now):
+        """Turn the wheel up to game time `now`, firing everything due."""
+        target = self._tick_of(now)
+        mask = self.slots - 1
+        while self.tick <= target:
+            t = self.tick
+            # When a level's index wraps, the slot of the level above that is
+            # now current is spread over the levels below
+            level = 1
+            while level < self.levels and (t >> (self.bits * (level - 1))) & mask == 0:
+                index = (t >> (self.bits * level)) & mask
+                slot, self.wheel[level][index] = self.wheel[level][index], []
+                for timer in slot:
+                    if not timer.cancelled:
+                        self.cascaded += 1
+                        self._add(timer)
+                if index:
+                    break
+                level += 1
+            slot, self.wheel[0][t & mask] = self.wheel[0][t & mask], []
+            self.tick = t + 1   # anything scheduled by a callback lands from the next tick on
+            for timer in slot:
+                if timer.cancelled:
+                    continue
+                self.fired += 1
+                if timer.period is not None and timer.times != 1:
+                    if timer.times is not None:
+                        timer.times -= 1
+                    timer.at += timer.period
+                    self._add(timer)
+                else:
+                    timer.cancelled = True   # spent; cancel() on it is a no-op
+                timer.callback(*timer.args)
+
+    def pending(self):
+        return sum(not timer.cancelled for level in self.wheel for slot in level for timer in slot)
+
+    def stats(self):
+        return {"fired": self.fired, "cascaded": self.cascaded, "pending": self.pending()}
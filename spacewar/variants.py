@@ -0,0 +1,75 @@
+import copy
+import json
+import os
+
+# ---------------- VARIANTS ----------------
+# A variant is a JSON file in variants/ listing only what it changes from
+# DEFAULTS; "assets" and "spawns" entries are merged one entry at a time.
+# Asset specs are {"file", "size", "color"}: a missing file falls back to a
+# plain `color` rect of `size`, or to nothing when there is no color (see
+# assets.py).
+VARIANT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "variants")
+
+DEFAULTS = {
+    "caption": "Space War:Ceaser",
+    "title": "Space War:Ceaser",        # menu heading
+    "screen": [1300, 750],
+    "fire": "tap",                      # tap: a volley per SPACE press; hold: while SPACE is held; auto: always
+    "shoot_delay": 1000,                # ms between volleys when firing is held or automatic
+    "spawns": {                         # per enemy kind, see director.py; null turns a kind off
+        "minion": {"rate": [[0, 30], [300, 60], [900, 120]], "cap": 250},   # per minute over seconds of play
+        "boss": {"every": 25, "cap": 1},
+    },
+    "wave_every": 2000,                 # ms between waves of streamed spawns
+    "enemy_cap": 300,                   # live enemies of all kinds
+    "update_budget_ms": 8.0,            # streamed spawns slow down while an update costs more than this
+    "spawn_margin": 64,                 # spawn ring starts this many px off screen
+    "explosion_damage_step": 1,         # gained per Explosion Damage+ upgrade
+    "boss_ends_run": False,             # killing a boss wins the run instead of paying out upgrades
+    "boss": {
+        "hp": [100, 30],                # base, plus this much per strength level
+        "speed": [1.5, 0],
+        "damage": 15,                   # per contact
+        "phase2": True,                 # below half hp: faster, harder hitting, summons minions
+    },
+    "life_steal_step": 0.05,            # gained per Life Steal upgrade
+    "separation": 0.5,                  # push between overlapping enemies per update; 0 lets them stack
+    "lod_margin": 64,                   # px outside the screen where enemies drop to half-rate updates
+    "lod_far": 900,                     # px from the player beyond which they drop to quarter rate
+    "ai_buckets": 4,                    # enemies re-aim once every this many updates
+    "ai_budget_ms": 2.0,                # time per update for per-enemy decisions; null for no limit
+    "upgrades": ["Increase Damage", "Increase Speed", "Add/Upgrade Orb", "Max HP Boost", "XP Boost",
+                 "Magnet Radius", "Explosion Damage+", "Orb Speed+", "Life Steal", "Multishot", "Laser Beam",
+                 "Burning Explosion", "Poison Bullets", "Frost Orbs"],
+    "assets": {
+        "background": {"file": "background.png"},
+        "player": {"file": "player.png", "size": [60, 60]},
+        "bullet": {"file": "bullet.png", "size": [40, 40], "color": [255, 255, 0]},
+        "boss": {"file": "boss.png", "size": [100, 100], "color": [180, 0, 180]},
+        "minion": {"file": "enemy.png", "size": [60, 60], "color": [200, 0, 0]},
+        "xp_gem": {"file": "xp_gem.png", "size": [30, 30], "color": [255, 255, 0]},
+        "heart": {"file": "heart.png", "size": [30, 30], "color": [255, 100, 150]},
+        "orb": {"file": "orb.png", "size": [15, 15], "color": [50, 150, 255]},
+    },
+}
+
+def variant_names():
+    return sorted(f[:-5] for f in os.listdir(VARIANT_DIR) if f.endswith(".json"))
+
+def load_variant(name="main"):
+    """DEFAULTS updated with variants/<name>.json, or with the JSON file at
+    `name` if it is a path."""
+    path = name if name.endswith(".json") else os.path.join(VARIANT_DIR, name + ".json")
+    if not os.path.exists(path):
+        raise ValueError(f"unknown variant {name!r}; have {', '.join(variant_names())}")
+    with open(path) as f:
+        changes = json.load(f)
+    variant = copy.deepcopy(DEFAULTS)
+    for key in ("assets", "spawns", "boss"):
+        variant[key].update(changes.pop(key, {}))
+    unknown = set(changes) - set(variant)
+    if unknown:
+        raise ValueError(f"{path}: unknown keys {', '.join(sorted(unknown))}")
+    variant.update(changes)
+    variant["name"] = os.path.splitext(os.path.basename(path))[0]
+    return variant
@@ -0,0 +1,5 @@
+import os
+
+# The engine opens a display in setup(); tests run without one
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
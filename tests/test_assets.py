@@ -0,0 +1,17 @@
+import pygame
+import pytest
+
+from spacewar import assets
+
+@pytest.fixture(scope="module", autouse=True)
+def display():
+    pygame.init()
+    pygame.display.set_mode((10, 10))   # image() converts surfaces, which needs a display
+
+def test_rotated_fallback_keeps_its_mask_size():
+    """A colour placeholder rotated off the axes covers about as many pixels as
+    upright: its corners are transparent, not padded with the fill colour."""
+    square = assets.image({"size": [10, 10], "color": [255, 255, 0]}, (10, 10))
+    upright = assets.rotated_mask(square, 0).count()
+    for angle in (30, 45, 60):
+        assert assets.rotated_mask(square, angle).count() == pytest.approx(upright, rel=0.05)
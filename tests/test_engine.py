@@ -0,0 +1,64 @@
+import pytest
+
+from spacewar import engine
+
+def start(variant="main"):
+    engine.setup(variant)
+    engine.start_game()
+    engine.player.max_hp = engine.player.hp = 10**9   # nothing ends the run early
+
+def test_timer_text_after_steps():
+    start()
+    inputs = engine.Inputs()
+    for _ in range(engine.SIM_HZ * 12):
+        engine.step(inputs)
+    assert engine.timer_text() == "00:12"
+
+def test_effect_timer_skips_recycled_enemy():
+    """A status effect outliving its enemy must not land on the next enemy
+    the pool hands the same object to."""
+    start()
+    first = engine.Enemy.pool.acquire(-500, -500, 0)
+    engine.afflict(first, "slow")
+    engine.enemy_store.remove(first)   # gone without resolve_deaths() cancelling its timers
+    second = engine.Enemy.pool.acquire(-500, -500, 0)
+    assert second is first
+    speed = second.speed
+    for _ in range(engine.SIM_HZ * 3):
+        engine.step(engine.Inputs())
+    assert second.speed == speed
+
+def test_py2_boss_keeps_its_own_stats():
+    start("py2")
+    boss = engine.Boss(-500, -500, 3)
+    assert (boss.max_hp, boss.damage) == ((2 + 3) * 20, 2)
+    assert boss.speed == pytest.approx(2 + 3 * 0.1)
+    boss.hp = 1
+    boss.update(3)
+    assert boss.phase == 1 and "summon" not in boss.timers
+
+def test_boss_reward_waits_for_open_level_up():
+    """A level-up and a boss kill in the same update: both screens are offered."""
+    start()
+    engine.pending_levels = 1
+    engine.next_level_up()
+    assert engine.game_state == engine.LEVEL_UP
+    engine.kill(engine.Boss(-500, -500, 0))
+    engine.resolve_deaths()
+    assert len(engine.upgrade_buttons) == 3   # the level-up screen is still the one shown
+    engine.upgrade_buttons[0].action()
+    assert engine.game_state == engine.LEVEL_UP
+    assert engine.upgrade_buttons[-1].text == "Boss Reward!"
+    engine.upgrade_buttons[0].action()
+    assert engine.game_state == engine.GAME
+
+def test_recycled_bullet_follows_variant_switch():
+    start("main")
+    bullet = engine.Bullet.pool.acquire(0, 0, 1, 0, 1)
+    engine.bullets.add(bullet)
+    engine.bullets.remove(bullet)   # back to the pool
+    start("hackbattle")
+    again = engine.Bullet.pool.acquire(0, 0, 1, 0, 1)
+    assert again is bullet
+    assert again.image is engine.assets.rotated(engine.BULLET_IMG, 0)
+    assert again.image.get_size() == engine.BULLET_IMG.get_size()
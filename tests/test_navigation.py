@@ -0,0 +1,44 @@
+import random
+
+import numpy as np
+
+from spacewar.navigation import FlowField
+
+TILE = 32
+
+def random_map(rng, rows, cols, walls):
+    return np.array([[rng.random() >= walls for _ in range(cols)] for _ in range(rows)])
+
+def fresh(passable, goal):
+    field = FlowField(passable, TILE, cache=0)
+    field.set_goal((goal[0] + 0.5) * TILE, (goal[1] + 0.5) * TILE)
+    return field
+
+def test_repair_matches_rebuild():
+    """A field repaired from the previous goal's costs equals one built from scratch."""
+    rng = random.Random(20)
+    repairs = 0
+    for _ in range(30):
+        rows, cols = rng.randint(3, 20), rng.randint(3, 20)
+        passable = random_map(rng, rows, cols, rng.choice([0.0, 0.15, 0.35]))
+        field = FlowField(passable, TILE, cache=rng.choice([0, 4]))
+        for _ in range(15):
+            goal = (rng.randrange(cols), rng.randrange(rows))
+            field.set_goal((goal[0] + 0.5) * TILE, (goal[1] + 0.5) * TILE)
+            ref = fresh(passable, goal)
+            assert np.array_equal(field.cost, ref.cost)
+            assert np.array_equal(field.flow, ref.flow)
+        repairs += field.repairs
+    assert repairs > 0
+
+def test_set_passable_matches_rebuild():
+    rng = random.Random(21)
+    passable = random_map(rng, 12, 16, 0.2)
+    field = FlowField(passable, TILE)
+    field.set_goal(5 * TILE, 5 * TILE)
+    for _ in range(20):
+        col, row = rng.randrange(16), rng.randrange(12)
+        field.set_passable(col, row, rng.random() < 0.5)
+        ref = fresh(field.passable, field.goal)
+        assert np.array_equal(field.cost, ref.cost)
+        assert np.array_equal(field.flow, ref.flow)